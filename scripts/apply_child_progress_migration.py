@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Apply child_progress function migration to database.
+"""
+import os
+import sys
+from pathlib import Path
+
+import psycopg
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    """Apply the child_progress function migration."""
+    migration_file = Path(__file__).parent.parent / "studybuddy" / "backend" / "db" / "sql" / "migration_add_child_progress_function.sql"
+
+    if not migration_file.exists():
+        print(f"ERROR: Migration file not found: {migration_file}")
+        sys.exit(1)
+
+    # Check for database connection settings
+    url = os.getenv("SUPABASE_URL")
+    password = os.getenv("SUPABASE_DB_PASSWORD")
+
+    if not url or not password:
+        print("ERROR: Database connection not configured")
+        print("Set SUPABASE_URL and SUPABASE_DB_PASSWORD environment variables")
+        sys.exit(1)
+
+    # Parse connection details
+    host = url.replace("https://", "").replace("http://", "").split("/")[0]
+    project_ref = host.split(".")[0]
+
+    conn_params = {
+        "host": "aws-1-us-west-1.pooler.supabase.com",
+        "port": 6543,
+        "dbname": "postgres",
+        "user": f"postgres.{project_ref}",
+        "password": password,
+    }
+
+    print("🔄 Applying child_progress function migration...")
+    print(f"  Host: {conn_params['host']}")
+    print(f"  User: {conn_params['user']}")
+
+    try:
+        conn = psycopg.connect(**conn_params)
+        cursor = conn.cursor()
+
+        # Read migration SQL
+        with migration_file.open("r", encoding="utf-8") as f:
+            sql = f.read()
+
+        print(f"\n📝 Applying migration from: {migration_file.name}")
+        cursor.execute(sql)
+        conn.commit()
+
+        print("✅ Migration applied successfully!")
+
+        # Verify the function was created
+        cursor.execute("SELECT EXISTS (SELECT FROM pg_proc WHERE proname = 'child_progress')")
+        exists = cursor.fetchone()[0]
+
+        if exists:
+            print("✅ child_progress() function exists")
+        else:
+            print("❌ child_progress() function was not created")
+            sys.exit(1)
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
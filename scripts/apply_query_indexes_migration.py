@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Apply query index migration to database.
+"""
+import os
+import sys
+from pathlib import Path
+
+import psycopg
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _statements(sql: str) -> list[str]:
+    """Split the migration into individual statements, ignoring comment lines."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def main():
+    """Apply the query index migration."""
+    migration_file = Path(__file__).parent.parent / "studybuddy" / "backend" / "db" / "sql" / "migration_add_query_indexes.sql"
+
+    if not migration_file.exists():
+        print(f"ERROR: Migration file not found: {migration_file}")
+        sys.exit(1)
+
+    # Check for database connection settings
+    url = os.getenv("SUPABASE_URL")
+    password = os.getenv("SUPABASE_DB_PASSWORD")
+
+    if not url or not password:
+        print("ERROR: Database connection not configured")
+        print("Set SUPABASE_URL and SUPABASE_DB_PASSWORD environment variables")
+        sys.exit(1)
+
+    # Parse connection details
+    host = url.replace("https://", "").replace("http://", "").split("/")[0]
+    project_ref = host.split(".")[0]
+
+    conn_params = {
+        "host": "aws-1-us-west-1.pooler.supabase.com",
+        "port": 6543,
+        "dbname": "postgres",
+        "user": f"postgres.{project_ref}",
+        "password": password,
+    }
+
+    print("🔄 Applying query index migration...")
+    print(f"  Host: {conn_params['host']}")
+    print(f"  User: {conn_params['user']}")
+
+    try:
+        conn = psycopg.connect(**conn_params)
+        # CREATE INDEX CONCURRENTLY refuses to run inside a transaction block
+        conn.autocommit = True
+        cursor = conn.cursor()
+
+        # Read migration SQL
+        with migration_file.open("r", encoding="utf-8") as f:
+            sql = f.read()
+
+        print(f"\n📝 Applying migration from: {migration_file.name}")
+        for statement in _statements(sql):
+            print(f"  → {statement.splitlines()[0]}")
+            cursor.execute(statement)
+
+        print("✅ Migration applied successfully!")
+
+        # Check indexes
+        cursor.execute("""
+            SELECT tablename, indexname FROM pg_indexes
+            WHERE schemaname = 'public'
+            ORDER BY tablename, indexname
+        """)
+        indexes = cursor.fetchall()
+        print(f"✅ {len(indexes)} indexes present:")
+        for table, index in indexes:
+            print(f"   - {table}.{index}")
+
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
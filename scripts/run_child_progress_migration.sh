@@ -0,0 +1,11 @@
+#!/bin/bash
+# Wrapper script to apply child_progress function migration with proper environment
+
+# Load environment variables
+set -a
+source .env
+set +a
+
+# Activate virtual environment and run migration script
+source testai-env/bin/activate
+python3 scripts/apply_child_progress_migration.py
@@ -0,0 +1,11 @@
+#!/bin/bash
+# Wrapper script to apply parent auth functions migration with proper environment
+
+# Load environment variables
+set -a
+source .env
+set +a
+
+# Activate virtual environment and run migration script
+source testai-env/bin/activate
+python3 scripts/apply_parent_auth_migration.py
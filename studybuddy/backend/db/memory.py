@@ -1,18 +1,44 @@
 """In-memory repository for local development and tests."""
 from __future__ import annotations
 
+import json
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Iterable, Optional
 from uuid import uuid4
 
-from ..services.hashing import hash_question
+from ..services.hashing import question_digest
 from ..services.security import generate_token, hash_password, verify_password
 
 SEED_DIR = Path(__file__).resolve().parent / "sql"
 
+# Question hashes are held as raw digest bytes internally and exposed as hex.
+QuestionHash = bytes | str
+
+
+def _pack_hash(value: QuestionHash) -> QuestionHash:
+    """Convert a hex hash to digest bytes, leaving non-hex identifiers untouched."""
+    if isinstance(value, bytes):
+        return value
+    try:
+        packed = bytes.fromhex(value)
+    except ValueError:
+        return value
+    return packed if packed.hex() == value else value
+
+
+def _unpack_hash(value: QuestionHash) -> str:
+    return value.hex() if isinstance(value, bytes) else value
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Share one object per metadata value (subject/topic/...) across records."""
+    return sys.intern(value) if value else value
+
 
 @dataclass
 class ParentRecord:
@@ -47,7 +73,7 @@ class QuestionRecord:
     correct_answer: str
     rationale: Optional[str]
     source: Optional[str]
-    hash: str
+    hash: QuestionHash
     created_at: datetime = field(default_factory=datetime.utcnow)
 
 
@@ -99,10 +125,12 @@ class MemoryRepository:
         self.parents_by_email: dict[str, ParentRecord] = {}
         self.children: dict[str, ChildRecord] = {}
         self.questions: dict[str, QuestionRecord] = {}
+        self._questions_by_hash: dict[QuestionHash, QuestionRecord] = {}
         self.attempts: list[AttemptRecord] = []
         self.tokens: dict[str, str] = {}  # token -> parent_id
         self.standards: list[dict[str, Any]] = []
-        self.seen_question_hashes: defaultdict[str, set[str]] = defaultdict(set)
+        self._standard_refs: set[str] = set()
+        self.seen_question_hashes: defaultdict[str, set[QuestionHash]] = defaultdict(set)
         self.quiz_sessions: dict[str, QuizSessionRecord] = {}
         self.quiz_session_questions: list[QuizSessionQuestionRecord] = []
         self._load_seed_data()
@@ -148,6 +176,10 @@ class MemoryRepository:
         child = self.children.get(child_id)
         return self._child_to_dict(child) if child else None
 
+    def get_child_for_parent(self, child_id: str, parent_id: str) -> Optional[dict[str, Any]]:
+        child = self.children.get(child_id)
+        return self._child_to_dict(child) if child and child.parent_id == parent_id else None
+
     def list_children(self, parent_id: str) -> list[dict[str, Any]]:
         return [
             self._child_to_dict(child)
@@ -196,12 +228,20 @@ class MemoryRepository:
     def list_standards(self) -> list[dict[str, Any]]:
         return self.standards
 
+    def find_standards(self, *, subject: str | None = None, grade: int | None = None) -> list[dict[str, Any]]:
+        wanted = subject.casefold() if subject is not None else None
+        return [
+            standard
+            for standard in self.standards
+            if (wanted is None or (standard.get("subject") or "").casefold() == wanted)
+            and (grade is None or standard.get("grade") == grade)
+        ]
+
     def insert_standard(self, subject: str, grade: int, domain: str, sub_domain: str,
                        standard_ref: str, title: str, description: str) -> None:
         """Insert a single standard into memory."""
         # Check if standard already exists
-        existing = any(s.get("standard_ref") == standard_ref for s in self.standards)
-        if existing:
+        if standard_ref in self._standard_refs:
             print(f"[INSERT_STANDARD] Standard {standard_ref} already exists, skipping")
             return
 
@@ -216,6 +256,7 @@ class MemoryRepository:
             "description": description
         }
         self.standards.append(standard)
+        self._standard_refs.add(standard_ref)
 
     # ------------------------------------------------------------------
     # Questions & attempts
@@ -235,7 +276,7 @@ class MemoryRepository:
         ]
 
     def list_seen_question_hashes(self, child_id: str) -> list[str]:
-        return list(self.seen_question_hashes.get(child_id, set()))
+        return [_unpack_hash(value) for value in self.seen_question_hashes.get(child_id, ())]
 
     def list_questions(
         self,
@@ -246,11 +287,18 @@ class MemoryRepository:
         subtopic: Optional[str] = None,
         difficulties: Iterable[str] | None = None,
         exclude_hashes: Iterable[str] | None = None,
+        limit: Optional[int] = None,
     ) -> list[dict[str, Any]]:
         difficulties_set = {d for d in (difficulties or []) if d}
-        exclude = set(exclude_hashes or [])
+        exclude = {_pack_hash(value) for value in (exclude_hashes or ())}
         results: list[QuestionRecord] = []
+        # ``self.questions`` iterates in insertion order, which _store_question
+        # keeps identical to created_at order.
         for record in self.questions.values():
+            if limit is not None and len(results) >= limit:
+                break
+            if record.hash in exclude:
+                continue
             if record.subject != subject:
                 continue
             if topic and record.topic != topic:
@@ -261,10 +309,7 @@ class MemoryRepository:
                 continue
             if difficulties_set and (record.difficulty or "easy") not in difficulties_set:
                 continue
-            if record.hash in exclude:
-                continue
             results.append(record)
-        results.sort(key=lambda q: q.created_at)
         return [self._question_to_dict(record) for record in results]
 
     def count_questions(
@@ -280,21 +325,24 @@ class MemoryRepository:
         )
 
     def insert_questions(self, questions: list[dict[str, Any]]) -> None:
+        by_hash = self._questions_by_hash
+        new_records: dict[str, QuestionRecord] = {}
         for payload in questions:
             stem = payload["stem"]
             options = payload["options"]
             answer = payload["correct_answer"]
-            question_hash = payload.get("hash") or hash_question(stem, options, answer)
-            if any(q.hash == question_hash for q in self.questions.values()):
+            given_hash = payload.get("hash")
+            question_hash = _pack_hash(given_hash) if given_hash else question_digest(stem, options, answer)
+            if question_hash in by_hash:
                 continue
             record = QuestionRecord(
                 id=payload.get("id", str(uuid4())),
                 standard_ref=payload.get("standard_ref", ""),
-                subject=payload.get("subject", "math"),
+                subject=_intern(payload.get("subject", "math")),
                 grade=payload.get("grade"),
-                topic=payload.get("topic"),
-                sub_topic=payload.get("sub_topic"),
-                difficulty=payload.get("difficulty"),
+                topic=_intern(payload.get("topic")),
+                sub_topic=_intern(payload.get("sub_topic")),
+                difficulty=_intern(payload.get("difficulty")),
                 stem=stem,
                 options=list(options),
                 correct_answer=answer,
@@ -302,7 +350,16 @@ class MemoryRepository:
                 source=payload.get("source"),
                 hash=question_hash,
             )
-            self.questions[record.id] = record
+            previous = new_records.pop(record.id, None)
+            if previous is not None:
+                del by_hash[previous.hash]
+            new_records[record.id] = record
+            by_hash[question_hash] = record
+        # Merge the whole batch in one update; replaced ids are dropped first
+        # so they re-enter at the end and keep created_at order.
+        for question_id in new_records.keys() & self.questions.keys():
+            self._discard_question(question_id)
+        self.questions.update(new_records)
 
     def fetch_questions(
         self,
@@ -315,13 +372,13 @@ class MemoryRepository:
         child = self.children.get(child_id)
         if child is None:
             raise ValueError("Unknown child")
-        questions = self.list_questions(
+        return self.list_questions(
             subject=subject,
             topic=topic,
             grade=child.grade,
             exclude_hashes=self.seen_question_hashes[child_id],
+            limit=limit,
         )
-        return questions[:limit]
 
     def log_attempt(
         self,
@@ -353,42 +410,40 @@ class MemoryRepository:
         }
 
     def child_progress(self, child_id: str) -> dict[str, Any]:
-        attempts = [a for a in self.attempts if a.child_id == child_id]
-        total = len(attempts)
-        correct = sum(1 for a in attempts if a.correct)
-        accuracy = (correct / total) if total else 0.0
-        streak = 0
-        for attempt in reversed(attempts):
+        # One pass over the attempt log: the streak resets on every miss, so
+        # it ends up counting the attempts since the most recent one.
+        total = correct = streak = 0
+        by_subject: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+        questions = self.questions
+        for attempt in self.attempts:
+            if attempt.child_id != child_id:
+                continue
+            total += 1
             if attempt.correct:
+                correct += 1
                 streak += 1
             else:
-                break
-        by_subject: defaultdict[str, dict[str, Any]] = defaultdict(lambda: {"correct": 0, "total": 0})
-        for attempt in attempts:
-            question = self.questions.get(attempt.question_id)
-            if not question:
-                continue
-            stats = by_subject[question.subject]
-            stats["total"] += 1
-            if attempt.correct:
-                stats["correct"] += 1
-        normalized_subjects: dict[str, dict[str, Any]] = {}
-        for subject, subject_stats in by_subject.items():
-            total_subject = subject_stats["total"]
-            accuracy_value = (
-                subject_stats["correct"] / total_subject if total_subject else 0.0
-            )
-            normalized_subjects[subject] = {
-                "correct": subject_stats["correct"],
-                "total": total_subject,
-                "accuracy": accuracy_value,
-            }
+                streak = 0
+            question = questions.get(attempt.question_id)
+            if question is not None:
+                stats = by_subject[question.subject]
+                stats[1] += 1
+                if attempt.correct:
+                    stats[0] += 1
         return {
             "attempted": total,
             "correct": correct,
-            "accuracy": accuracy,
+            # Integer percentages (0-100), matching ProgressResponse
+            "accuracy": round(correct / total * 100) if total else 0,
             "current_streak": streak,
-            "by_subject": normalized_subjects,
+            "by_subject": {
+                subject: {
+                    "correct": subject_correct,
+                    "total": subject_total,
+                    "accuracy": round(subject_correct / subject_total * 100),
+                }
+                for subject, (subject_correct, subject_total) in by_subject.items()
+            },
         }
 
     # ------------------------------------------------------------------
@@ -406,6 +461,10 @@ class MemoryRepository:
         """Stub implementation - returns empty list in memory mode."""
         return []
 
+    def list_topics(self, subject: str, grade: int) -> list[str]:
+        """Stub implementation - returns empty list in memory mode."""
+        return []
+
     def get_subtopic(self, subtopic_id: str) -> dict | None:
         """Stub implementation - subtopics not supported in memory mode."""
         return None
@@ -420,7 +479,7 @@ class MemoryRepository:
         """Get question hashes from recent attempts (for repeat reduction window)."""
         # Get child's attempts sorted by newest first
         child_attempts = [
-            a for a in sorted(self.attempts, key=lambda x: x.created_at, reverse=True)
+            a for a in sorted(self.attempts, key=attrgetter("created_at"), reverse=True)
             if a.child_id == child_id
         ]
 
@@ -430,7 +489,7 @@ class MemoryRepository:
         for attempt in child_attempts[:limit]:
             question = self.questions.get(attempt.question_id)
             if question and question.hash not in seen:
-                recent_hashes.append(question.hash)
+                recent_hashes.append(_unpack_hash(question.hash))
                 seen.add(question.hash)
 
         return recent_hashes
@@ -466,6 +525,30 @@ class MemoryRepository:
         self.quiz_sessions[session_id] = record
         return self._quiz_session_to_dict(record)
 
+    def create_quiz_session_with_questions(
+        self, *,
+        child_id: str,
+        subject: str,
+        topic: str,
+        subtopic: str | None,
+        question_count: int,
+        duration_sec: int,
+        difficulty_mix: dict,
+        questions: list[dict],
+    ) -> dict:
+        """Create a quiz session together with its questions."""
+        session = self.create_quiz_session(
+            child_id=child_id,
+            subject=subject,
+            topic=topic,
+            subtopic=subtopic,
+            question_count=question_count,
+            duration_sec=duration_sec,
+            difficulty_mix=difficulty_mix,
+        )
+        self.create_quiz_session_questions(session["id"], questions)
+        return session
+
     def get_quiz_session(self, session_id: str) -> dict | None:
         """Get a quiz session by ID."""
         record = self.quiz_sessions.get(session_id)
@@ -478,7 +561,7 @@ class MemoryRepository:
             if s.child_id == child_id
         ]
         # Sort by started_at descending
-        sessions.sort(key=lambda x: x.started_at, reverse=True)
+        sessions.sort(key=attrgetter("started_at"), reverse=True)
         return [self._quiz_session_to_dict(s) for s in sessions[offset:offset + limit]]
 
     def check_active_quiz(self, child_id: str, subject: str, topic: str) -> dict | None:
@@ -513,7 +596,7 @@ class MemoryRepository:
             q for q in self.quiz_session_questions
             if q.quiz_session_id == session_id
         ]
-        session_questions.sort(key=lambda x: x.index)
+        session_questions.sort(key=attrgetter("index"))
 
         # Join with full question data
         result = []
@@ -532,15 +615,17 @@ class MemoryRepository:
 
     def submit_quiz_session(self, session_id: str, answers: list[dict]) -> dict:
         """Submit answers for a quiz session."""
+        session_questions = [q for q in self.quiz_session_questions if q.quiz_session_id == session_id]
+
         # Update quiz session questions with answers
-        for answer in answers:
-            for sq in self.quiz_session_questions:
-                if sq.quiz_session_id == session_id and sq.question_id == answer["question_id"]:
-                    sq.selected_choice = answer.get("selected_choice", "")
-                    sq.is_correct = answer.get("is_correct", False)
+        answers_by_question = {answer["question_id"]: answer for answer in answers}
+        for sq in session_questions:
+            answer = answers_by_question.get(sq.question_id)
+            if answer is not None:
+                sq.selected_choice = answer.get("selected_choice", "")
+                sq.is_correct = answer.get("is_correct", False)
 
         # Calculate score
-        session_questions = [q for q in self.quiz_session_questions if q.quiz_session_id == session_id]
         correct_count = sum(1 for q in session_questions if q.is_correct)
         total = len(session_questions)
         score = round((correct_count / total) * 100) if total > 0 else 0
@@ -569,35 +654,45 @@ class MemoryRepository:
         record = QuestionRecord(
             id=q_id,
             standard_ref=question.get("standard_ref", ""),
-            subject=question.get("subject", ""),
+            subject=_intern(question.get("subject", "")),
             grade=question.get("grade"),
-            topic=question.get("topic"),
-            sub_topic=question.get("subtopic"),
-            difficulty=question.get("difficulty"),
+            topic=_intern(question.get("topic")),
+            sub_topic=_intern(question.get("subtopic")),
+            difficulty=_intern(question.get("difficulty")),
             stem=question.get("stem", ""),
             options=question.get("options", []),
             correct_answer=question.get("correct_answer", ""),
             rationale=question.get("rationale", ""),
             source=question.get("source", "generated"),
-            hash=question.get("hash", ""),
+            hash=_pack_hash(question.get("hash", "")),
         )
-        self.questions[q_id] = record
+        self._store_question(record)
         return self._question_to_dict(record)
 
     # ------------------------------------------------------------------
     # Helpers
+    def _store_question(self, record: QuestionRecord) -> None:
+        """Store a question, moving replaced ids to the end to keep created_at order."""
+        self._discard_question(record.id)
+        self.questions[record.id] = record
+        self._questions_by_hash[record.hash] = record
+
+    def _discard_question(self, question_id: str) -> None:
+        record = self.questions.pop(question_id, None)
+        if record is not None and self._questions_by_hash.get(record.hash) is record:
+            del self._questions_by_hash[record.hash]
+
     def _load_seed_data(self) -> None:
         standards_path = SEED_DIR / "seed_standards.json"
         if standards_path.exists():
             self.standards = self._load_json(standards_path)
+            self._standard_refs = {s.get("standard_ref") for s in self.standards}
         questions_path = SEED_DIR / "seed_questions.json"
         if questions_path.exists():
             raw_questions = self._load_json(questions_path)
             self.insert_questions(raw_questions)
 
     def _load_json(self, path: Path) -> list[dict[str, Any]]:
-        import json
-
         with path.open("r", encoding="utf-8") as handle:
             return json.load(handle)
 
@@ -632,7 +727,7 @@ class MemoryRepository:
             "correct_answer": record.correct_answer,
             "rationale": record.rationale,
             "source": record.source,
-            "hash": record.hash,
+            "hash": _unpack_hash(record.hash),
         }
 
     @staticmethod
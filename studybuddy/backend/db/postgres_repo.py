@@ -1,76 +1,281 @@
 """Direct PostgreSQL repository implementation."""
 from __future__ import annotations
 
+import atexit
+import json
+import logging
 import os
-from typing import Iterable
-
-import psycopg2
-from psycopg2.extras import RealDictCursor
-
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
+
+from psycopg import Connection
+from psycopg.rows import dict_row, scalar_row, tuple_row
+from psycopg.types.json import Jsonb
+from psycopg.types.string import TextLoader
+from psycopg_pool import ConnectionPool
+
+from ..services.cache import TTLCache
 from ..services.hashing import hash_question
 from ..services.security import generate_token, hash_password, verify_password
-
-
-def _get_connection():
+from ..services.text_utils import normalize_metadata, normalize_subject, normalize_subtopic, normalize_topic
+
+logger = logging.getLogger(__name__)
+
+_POOL_MIN_CONN = 2
+_POOL_MAX_CONN = 20
+# Pooled connections are recycled after this many seconds so that sessions
+# dropped by Supabase's pooler (or a network hop in between) don't linger.
+_CONN_MAX_LIFETIME = 300.0
+
+# Executions of the same SQL text before psycopg turns it into a server-side
+# prepared statement. Supabase's transaction-mode pooler (port 6543) may hand
+# consecutive transactions to different backends, so this is opt-in via
+# STUDYBUDDY_PG_PREPARE and should only be enabled for session-mode or direct
+# connections.
+_PREPARE_THRESHOLD = 3
+
+_BATCH_PAGE_SIZE = 200
+
+# Token -> parent lookups run on every authenticated request. Keep the TTL short
+# so a revoked token stops working quickly.
+_TOKEN_CACHE: TTLCache[str, dict] = TTLCache(maxsize=10_000, ttl=60)
+
+# Standards are reference data and change only through insert_standard. The
+# cached entry is the full list plus indexes by casefolded subject and by
+# (casefolded subject, grade) for find_standards.
+_StandardsIndex = tuple[list[dict], dict[str, list[dict]], dict[tuple[str, int], list[dict]]]
+_STANDARDS_CACHE: TTLCache[str, _StandardsIndex] = TTLCache(maxsize=1, ttl=3600)
+
+# child_id -> seen question hashes, read on every question fetch. log_attempt
+# adds to a cached set in place; the short TTL bounds staleness when another
+# worker records the attempt.
+_SEEN_HASHES_CACHE: TTLCache[str, set[str]] = TTLCache(maxsize=1024, ttl=30)
+
+# Columns of a children row as the API's Child model uses them. Spelled out
+# rather than * so a wider table doesn't widen every child read and write.
+_CHILD_COLUMNS = "id, parent_id, name, birthdate, grade, zip, created_at"
+_ATTEMPT_COLUMNS = "id, child_id, question_id, selected, correct, time_spent_ms, created_at"
+# Everything but the image bytea, which no API response carries.
+_QUESTION_COLUMNS = (
+    "id, standard_ref, subject, grade, topic, sub_topic, difficulty, stem, options, "
+    "correct_answer, rationale, source, hash, created_at"
+)
+
+_POOL: ConnectionPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _connection_params() -> dict:
+    # Called once, when the pool is first opened. Not at import time: the
+    # app imports this module before load_dotenv() runs.
     url = os.environ.get("SUPABASE_URL")
     password = os.environ.get("SUPABASE_DB_PASSWORD")
 
     if not url or not password:
         raise RuntimeError("SUPABASE_URL and SUPABASE_DB_PASSWORD must be set")
 
-    host = url.replace("https://", "").replace("http://", "").split("/")[0]
-    project_ref = host.split(".")[0]
+    # Accept the URL with or without a scheme, e.g. "abcd.supabase.co".
+    host = urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    project_ref = host.split(".", 1)[0]
 
-    conn_params = {
+    return {
         "host": "aws-1-us-west-1.pooler.supabase.com",
         "port": 6543,
-        "database": "postgres",
+        "dbname": "postgres",
         "user": f"postgres.{project_ref}",
         "password": password,
     }
 
-    import logging
-    logging.warning(f"Connecting to {conn_params['host']}:{conn_params['port']} as {conn_params['user']}")
 
-    return psycopg2.connect(**conn_params)
+def _configure_connection(conn: Connection) -> None:
+    # Callers and the API models treat ids as strings, so load uuid columns as
+    # text rather than uuid.UUID.
+    conn.adapters.register_loader("uuid", TextLoader)
+
+
+def _get_pool() -> ConnectionPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                conn_params = _connection_params()
+                logger.info(
+                    "Opening connection pool to %s:%s as %s",
+                    conn_params.get("host"),
+                    conn_params.get("port"),
+                    conn_params.get("user"),
+                )
+                use_prepared = os.getenv("STUDYBUDDY_PG_PREPARE", "0").lower() in ("1", "true", "yes")
+                _POOL = ConnectionPool(
+                    min_size=_POOL_MIN_CONN,
+                    max_size=int(os.getenv("STUDYBUDDY_PG_POOL_MAX", _POOL_MAX_CONN)),
+                    max_lifetime=_CONN_MAX_LIFETIME,
+                    configure=_configure_connection,
+                    kwargs={
+                        "row_factory": dict_row,
+                        "prepare_threshold": _PREPARE_THRESHOLD if use_prepared else None,
+                        "keepalives": 1,
+                        "keepalives_idle": 30,
+                        "keepalives_interval": 10,
+                        "keepalives_count": 3,
+                        **conn_params,
+                    },
+                    open=True,
+                )
+                atexit.register(_close_pool)
+    return _POOL
+
+
+def _close_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None and not _POOL.closed:
+            _POOL.close()
+        _POOL = None
+
+
+def _execute_values(cur, query: str, rows: list[tuple], *, page_size: int = _BATCH_PAGE_SIZE) -> list:
+    """Insert ``rows`` as multi-row VALUES lists and return any rows the query returns.
+
+    ``query`` must contain a single ``%s`` standing for the VALUES list; rows
+    are sent ``page_size`` at a time.
+    """
+    returned: list = []
+    for offset in range(0, len(rows), page_size):
+        page = rows[offset:offset + page_size]
+        values = ", ".join("(" + ", ".join(["%s"] * len(row)) + ")" for row in page)
+        cur.execute(query.replace("%s", values, 1), [value for row in page for value in row])
+        if cur.description is not None:
+            returned.extend(cur.fetchall())
+    return returned
+
+
+@contextmanager
+def _conn() -> Iterator[Connection]:
+    # The pool commits on a clean exit, rolls back on error and replaces
+    # connections that are broken or past their lifetime.
+    with _get_pool().connection() as conn:
+        yield conn
+
+
+@contextmanager
+def _autocommit_conn() -> Iterator[Connection]:
+    """Like ``_conn`` but in autocommit mode, for work that is a single statement.
+
+    Skips the round trips for BEGIN and COMMIT and avoids leaving the backend
+    idle in a transaction; a lone statement is atomic on its own. Named
+    (server-side) cursors still need ``_conn``.
+    """
+    with _conn() as conn:
+        conn.autocommit = True
+        try:
+            yield conn
+        finally:
+            if not conn.closed:
+                conn.autocommit = False
+
+
+# Optional question_bank filters, in the order their parameters are bound.
+# _question_filters() returns a bitmask over this tuple.
+_QUESTION_FILTERS = (
+    " AND topic = %s",
+    " AND (grade = %s OR grade IS NULL)",
+    " AND sub_topic = %s",
+    # Lists are bound as single array parameters so the SQL text doesn't
+    # change with their length.
+    " AND difficulty = ANY(%s::text[])",
+    " AND hash <> ALL(%s::text[])",
+    " AND NOT EXISTS (SELECT 1 FROM seen_questions s"
+    " WHERE s.child_id = %s AND s.question_hash = question_bank.hash)",
+)
+
+
+def _question_filters(
+    *,
+    subject: str,
+    topic: str | None = None,
+    grade: int | None = None,
+    subtopic: str | None = None,
+    difficulties: Iterable[str] | None = None,
+    exclude_hashes: Iterable[str] | None = None,
+    exclude_child_id: str | None = None,
+) -> tuple[int, list]:
+    """Return the ``_QUESTION_FILTERS`` bitmask and bound parameters for a query."""
+    collection = [d for d in difficulties if d] if difficulties else []
+    hashes = list(exclude_hashes) if exclude_hashes else []
+    values = (
+        normalize_topic(topic) if topic else None,
+        grade,
+        normalize_subtopic(subtopic) if subtopic is not None else None,
+        collection or None,
+        hashes or None,
+        exclude_child_id,
+    )
+
+    filters = 0
+    params: list = [normalize_subject(subject)]
+    for bit, value in enumerate(values):
+        if value is not None:
+            filters |= 1 << bit
+            params.append(value)
+    return filters, params
+
+
+@lru_cache(maxsize=64)
+def _question_query(select: str, include_mock: bool, filters: int, suffix: str) -> str:
+    """Build (once per shape) the question_bank query for a filter bitmask."""
+    query = f"{select} FROM question_bank WHERE subject = %s"
+    if not include_mock:
+        query += " AND (source IS NULL OR source != 'mock')"
+    for bit, clause in enumerate(_QUESTION_FILTERS):
+        if filters & (1 << bit):
+            query += clause
+    return query + suffix
 
 
 class PostgresRepository:
     """Direct PostgreSQL repository bypassing Supabase SDK."""
 
     def __init__(self):
-        self.get_connection = _get_connection
+        # Exclude mock questions unless STUDYBUDDY_MOCK_AI is enabled. Read once
+        # here rather than per query; the repository is built after .env loads.
+        self._include_mock = os.getenv("STUDYBUDDY_MOCK_AI", "0") == "1"
 
     def create_parent(self, *, email: str, password: str) -> dict:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT id FROM parents WHERE email = %s", (email,))
-                if cur.fetchone():
-                    raise ValueError("Parent already exists")
-
-                password_hash = hash_password(password)
+        # Hash before taking a pooled connection; it is the slow part.
+        password_hash = hash_password(password)
+        token = generate_token()
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
+                # Parent and first token are written in one round trip; the
+                # token insert sees no row when the email is already taken.
                 cur.execute(
-                    "INSERT INTO parents (email, password_hash) VALUES (%s, %s) RETURNING id, email, created_at",
-                    (email, password_hash)
+                    """WITH p AS (
+                         INSERT INTO parents (email, password_hash) VALUES (%s, %s)
+                         ON CONFLICT (email) DO NOTHING
+                         RETURNING id, email, created_at
+                       ),
+                       t AS (
+                         INSERT INTO parent_tokens (token, parent_id) SELECT %s, id FROM p
+                       )
+                       SELECT id, email, created_at FROM p""",
+                    (email, password_hash, token)
                 )
-                parent = dict(cur.fetchone())
-
-                token = generate_token()
-                cur.execute(
-                    "INSERT INTO parent_tokens (token, parent_id) VALUES (%s, %s)",
-                    (token, parent["id"])
-                )
-                conn.commit()
+                parent = cur.fetchone()
+                if not parent:
+                    raise ValueError("Parent already exists")
 
-                return {"parent": parent, "token": token}
-        finally:
-            conn.close()
+        # The new token is used on the very next request; skip that lookup.
+        _TOKEN_CACHE.set(token, dict(parent))
+        return {"parent": parent, "token": token}
 
     def authenticate_parent(self, *, email: str, password: str) -> dict:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        # Both statements stand alone, so skip the surrounding transaction.
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     "SELECT id, email, password_hash, created_at FROM parents WHERE email = %s",
                     (email,)
@@ -79,210 +284,205 @@ class PostgresRepository:
                 if not parent or not verify_password(password, parent.get("password_hash", "")):
                     raise ValueError("Invalid credentials")
 
-                parent = dict(parent)
                 parent.pop("password_hash", None)
 
                 token = generate_token()
-                cur.execute(
-                    "INSERT INTO parent_tokens (token, parent_id) VALUES (%s, %s)",
-                    (token, parent["id"])
-                )
-                conn.commit()
+                cur.execute("INSERT INTO parent_tokens (token, parent_id) VALUES (%s, %s)", (token, parent["id"]))
 
-                return {"parent": parent, "token": token}
-        finally:
-            conn.close()
+        _TOKEN_CACHE.set(token, dict(parent))
+        return {"parent": parent, "token": token}
 
     def get_parent_by_token(self, token: str):
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cached = _TOKEN_CACHE.get(token)
+        if cached is not None:
+            return dict(cached)
+
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT parent_id FROM parent_tokens WHERE token = %s",
+                    "SELECT p.id, p.email, p.created_at FROM parent_tokens t "
+                    "JOIN parents p ON p.id = t.parent_id WHERE t.token = %s",
                     (token,)
                 )
-                record = cur.fetchone()
-                if not record:
+                parent = cur.fetchone()
+                if not parent:
                     return None
 
-                cur.execute(
-                    "SELECT id, email, created_at FROM parents WHERE id = %s",
-                    (record["parent_id"],)
-                )
-                parent = cur.fetchone()
-                return dict(parent) if parent else None
-        finally:
-            conn.close()
+                _TOKEN_CACHE.set(token, parent)
+                return dict(parent)
 
     def child_belongs_to_parent(self, child_id: str, parent_id: str) -> bool:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
-                    "SELECT id FROM children WHERE id = %s AND parent_id = %s",
-                    (child_id, parent_id)
-                )
+        with _autocommit_conn() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
+                cur.execute("SELECT 1 FROM children WHERE id = %s AND parent_id = %s", (child_id, parent_id))
                 return cur.fetchone() is not None
-        finally:
-            conn.close()
 
     def get_child(self, child_id: str) -> dict | None:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT * FROM children WHERE id = %s", (child_id,))
-                result = cur.fetchone()
-                return dict(result) if result else None
-        finally:
-            conn.close()
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT {_CHILD_COLUMNS} FROM children WHERE id = %s", (child_id,))
+                return cur.fetchone()
+
+    def get_child_for_parent(self, child_id: str, parent_id: str) -> dict | None:
+        """Return the child only if it belongs to ``parent_id`` (ownership check and fetch in one query)."""
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT {_CHILD_COLUMNS} FROM children WHERE id = %s AND parent_id = %s",
+                    (child_id, parent_id)
+                )
+                return cur.fetchone()
 
     def list_children(self, parent_id: str) -> list[dict]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT * FROM children WHERE parent_id = %s ORDER BY created_at",
+                    f"SELECT {_CHILD_COLUMNS} FROM children WHERE parent_id = %s ORDER BY created_at",
                     (parent_id,)
                 )
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
 
     def create_child(self, parent_id: str, payload: dict) -> dict:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 payload = {**payload, "parent_id": parent_id}
                 columns = ", ".join(payload.keys())
                 placeholders = ", ".join(["%s"] * len(payload))
                 cur.execute(
-                    f"INSERT INTO children ({columns}) VALUES ({placeholders}) RETURNING *",
+                    f"INSERT INTO children ({columns}) VALUES ({placeholders}) RETURNING {_CHILD_COLUMNS}",
                     tuple(payload.values())
                 )
-                result = dict(cur.fetchone())
+                result = cur.fetchone()
                 conn.commit()
                 return result
-        finally:
-            conn.close()
 
     def update_child(self, child_id: str, payload: dict) -> dict:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 if not payload:
-                    cur.execute("SELECT * FROM children WHERE id = %s", (child_id,))
+                    cur.execute(f"SELECT {_CHILD_COLUMNS} FROM children WHERE id = %s", (child_id,))
                     result = cur.fetchone()
                     if not result:
                         raise ValueError("Child not found")
-                    return dict(result)
+                    return result
 
                 set_clause = ", ".join([f"{k} = %s" for k in payload.keys()])
                 values = list(payload.values()) + [child_id]
                 cur.execute(
-                    f"UPDATE children SET {set_clause} WHERE id = %s RETURNING *",
+                    f"UPDATE children SET {set_clause} WHERE id = %s RETURNING {_CHILD_COLUMNS}",
                     values
                 )
                 result = cur.fetchone()
                 if not result:
                     raise ValueError("Child not found")
                 conn.commit()
-                return dict(result)
-        finally:
-            conn.close()
+                return result
 
     def delete_child(self, child_id: str) -> None:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
+                # attempts, seen_questions and sessions cascade from children
                 cur.execute("DELETE FROM children WHERE id = %s RETURNING id", (child_id,))
                 if not cur.fetchone():
                     raise ValueError("Child not found")
-                cur.execute("DELETE FROM attempts WHERE child_id = %s", (child_id,))
-                cur.execute("DELETE FROM seen_questions WHERE child_id = %s", (child_id,))
-                conn.commit()
-        finally:
-            conn.close()
+        _SEEN_HASHES_CACHE.pop(child_id)
+
+    def _standards_index(self) -> _StandardsIndex:
+        index = _STANDARDS_CACHE.get("all")
+        if index is None:
+            with _autocommit_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT * FROM standards ORDER BY grade")
+                    standards = cur.fetchall()
+            by_subject: dict[str, list[dict]] = {}
+            by_subject_grade: dict[tuple[str, int], list[dict]] = {}
+            for standard in standards:
+                subject = (standard["subject"] or "").casefold()
+                by_subject.setdefault(subject, []).append(standard)
+                by_subject_grade.setdefault((subject, standard["grade"]), []).append(standard)
+            index = (standards, by_subject, by_subject_grade)
+            _STANDARDS_CACHE.set("all", index)
+        return index
 
     def list_standards(self) -> list[dict]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT * FROM standards ORDER BY grade")
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+        standards, _, _ = self._standards_index()
+        return [dict(standard) for standard in standards]
+
+    def find_standards(self, *, subject: str | None = None, grade: int | None = None) -> list[dict]:
+        """Standards matching a case-insensitive subject and/or grade, in grade order."""
+        standards, by_subject, by_subject_grade = self._standards_index()
+        if subject is not None and grade is not None:
+            matches = by_subject_grade.get((subject.casefold(), grade), [])
+        elif subject is not None:
+            matches = by_subject.get(subject.casefold(), [])
+        elif grade is not None:
+            matches = [standard for standard in standards if standard["grade"] == grade]
+        else:
+            matches = standards
+        return [dict(standard) for standard in matches]
 
     def insert_standard(self, subject: str, grade: int, domain: str, sub_domain: str,
                        standard_ref: str, title: str, description: str) -> None:
         """Insert a single standard into the database."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Check if standard already exists
-                cur.execute(
-                    "SELECT id FROM standards WHERE standard_ref = %s",
-                    (standard_ref,)
-                )
-                existing = cur.fetchone()
-                if existing:
-                    print(f"[INSERT_STANDARD] Standard {standard_ref} already exists, skipping")
-                    return
-
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """
                     INSERT INTO standards (subject, grade, domain, sub_domain, standard_ref, title, description)
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (standard_ref) DO NOTHING
                     """,
                     (subject, grade, domain, sub_domain, standard_ref, title, description)
                 )
+                if cur.rowcount == 0:
+                    logger.debug("[INSERT_STANDARD] Standard %s already exists, skipping", standard_ref)
+                    return
                 conn.commit()
-        finally:
-            conn.close()
+        _STANDARDS_CACHE.clear()
 
     def list_child_attempts(self, child_id: str) -> list[dict]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT * FROM attempts WHERE child_id = %s ORDER BY created_at",
+                    f"SELECT {_ATTEMPT_COLUMNS} FROM attempts WHERE child_id = %s ORDER BY created_at",
                     (child_id,)
                 )
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
 
     def list_seen_question_hashes(self, child_id: str) -> list[str]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
-                    "SELECT question_hash FROM seen_questions WHERE child_id = %s",
-                    (child_id,)
-                )
-                return [row["question_hash"] for row in cur.fetchall()]
-        finally:
-            conn.close()
+        seen = _SEEN_HASHES_CACHE.get(child_id)
+        if seen is None:
+            with _autocommit_conn() as conn:
+                with conn.cursor(row_factory=scalar_row) as cur:
+                    cur.execute(
+                        "SELECT question_hash FROM seen_questions WHERE child_id = %s",
+                        (child_id,)
+                    )
+                    seen = set(cur.fetchall())
+            _SEEN_HASHES_CACHE.set(child_id, seen)
+        return list(seen)
 
     def list_recent_question_hashes(self, child_id: str, limit: int = 30) -> list[str]:
         """Get question hashes from recent attempts (for repeat reduction window)."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
                 # Get hashes from most recent N attempts
                 cur.execute(
                     """
-                    SELECT DISTINCT qb.hash
-                    FROM attempts a
+                    SELECT qb.hash
+                    FROM (
+                      SELECT question_id, created_at FROM attempts
+                      WHERE child_id = %s
+                      ORDER BY created_at DESC
+                      LIMIT %s
+                    ) a
                     JOIN question_bank qb ON a.question_id = qb.id
-                    WHERE a.child_id = %s
-                    ORDER BY a.created_at DESC
-                    LIMIT %s
+                    GROUP BY qb.hash
+                    ORDER BY MAX(a.created_at) DESC
                     """,
                     (child_id, limit)
                 )
-                return [row["hash"] for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
 
     def list_questions(
         self,
@@ -293,57 +493,35 @@ class PostgresRepository:
         subtopic: str | None = None,
         difficulties: Iterable[str] | None = None,
         exclude_hashes: Iterable[str] | None = None,
+        exclude_child_id: str | None = None,
+        limit: int | None = None,
     ) -> list[dict]:
-        from ..services.text_utils import normalize_subject, normalize_topic, normalize_subtopic
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Normalize inputs before querying
-                query = "SELECT * FROM question_bank WHERE subject = %s"
-                params = [normalize_subject(subject)]
-
-                # Exclude mock questions unless STUDYBUDDY_MOCK_AI is enabled
-                mock_mode = os.getenv("STUDYBUDDY_MOCK_AI", "0") == "1"
-                if not mock_mode:
-                    query += " AND (source IS NULL OR source != 'mock')"
-
-                if topic:
-                    query += " AND topic = %s"
-                    params.append(normalize_topic(topic))
-
-                if grade is not None:
-                    query += " AND (grade = %s OR grade IS NULL)"
-                    params.append(grade)
+        """List matching questions in random order.
 
-                if subtopic is not None:
-                    query += " AND sub_topic = %s"
-                    params.append(normalize_subtopic(subtopic))
-
-                if difficulties:
-                    collection = [d for d in difficulties if d]
-                    if collection:
-                        placeholders = ", ".join(["%s"] * len(collection))
-                        query += f" AND difficulty IN ({placeholders})"
-                        params.extend(collection)
-
-                if exclude_hashes:
-                    hashes = [h for h in exclude_hashes]
-                    if hashes:
-                        placeholders = ", ".join(["%s"] * len(hashes))
-                        query += f" AND hash NOT IN ({placeholders})"
-                        params.extend(hashes)
-
-                query += " ORDER BY RANDOM()"  # Randomize question order
+        ``exclude_child_id`` drops questions the child has already seen without
+        sending their hashes over the wire, and ``limit`` caps the rows returned.
+        """
+        # Normalize inputs before querying
+        filters, params = _question_filters(
+            subject=subject,
+            topic=topic,
+            grade=grade,
+            subtopic=subtopic,
+            difficulties=difficulties,
+            exclude_hashes=exclude_hashes,
+            exclude_child_id=exclude_child_id,
+        )
+        suffix = " ORDER BY RANDOM()"  # Randomize question order
+        if limit is not None:
+            suffix += " LIMIT %s"
+            params.append(limit)
+        query = _question_query(f"SELECT {_QUESTION_COLUMNS}", self._include_mock, filters, suffix)
+
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(query, params)
-                results = []
-                for row in cur.fetchall():
-                    question = dict(row)
-                    # JSONB columns are automatically deserialized by psycopg2
-                    results.append(question)
-                return results
-        finally:
-            conn.close()
+                # JSONB columns are automatically deserialized by psycopg
+                return cur.fetchall()
 
     def count_questions(
         self,
@@ -353,81 +531,80 @@ class PostgresRepository:
         grade: int | None = None,
         subtopic: str | None = None,
     ) -> int:
-        from ..services.text_utils import normalize_subject, normalize_topic, normalize_subtopic
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Normalize inputs before querying
-                query = "SELECT COUNT(*) as count FROM question_bank WHERE subject = %s"
-                params = [normalize_subject(subject)]
-
-                # Exclude mock questions unless STUDYBUDDY_MOCK_AI is enabled
-                mock_mode = os.getenv("STUDYBUDDY_MOCK_AI", "0") == "1"
-                if not mock_mode:
-                    query += " AND (source IS NULL OR source != 'mock')"
-
-                if topic:
-                    query += " AND topic = %s"
-                    params.append(normalize_topic(topic))
-
-                if grade is not None:
-                    query += " AND (grade = %s OR grade IS NULL)"
-                    params.append(grade)
-
-                if subtopic is not None:
-                    query += " AND sub_topic = %s"
-                    params.append(normalize_subtopic(subtopic))
+        # Normalize inputs before querying
+        filters, params = _question_filters(subject=subject, topic=topic, grade=grade, subtopic=subtopic)
+        query = _question_query("SELECT COUNT(*)", self._include_mock, filters, "")
 
+        with _autocommit_conn() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
                 cur.execute(query, params)
-                return cur.fetchone()["count"]
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     def insert_questions(self, questions: list[dict]) -> None:
-        import json
-        from ..services.text_utils import normalize_metadata
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                for question in questions:
-                    options = question["options"]
-                    answer = question["correct_answer"]
-                    stem = question["stem"]
-                    question_hash = question.get("hash") or hash_question(stem, options, answer)
-
-                    cur.execute(
-                        "SELECT id FROM question_bank WHERE hash = %s",
-                        (question_hash,)
-                    )
-                    existing = cur.fetchone()
-                    if existing:
-                        # Update the question object with the existing database ID
-                        question["id"] = existing["id"]
-                        print(f"[INSERT_Q] Question already exists with id={existing['id']}, updating question object", flush=True)
-                        continue
-
-                    payload = {**question, "hash": question_hash}
-                    payload.setdefault("id", os.urandom(16).hex())
+        if not questions:
+            return
+
+        hashes = [
+            question.get("hash") or hash_question(question["stem"], question["options"], question["correct_answer"])
+            for question in questions
+        ]
+
+        # Rows are grouped by column list so each group is one COPY; the first
+        # copy of a question in the batch wins.
+        pending: dict[tuple[str, ...], list[tuple]] = {}
+        batch_hashes: set[str] = set()
+        for question, question_hash in zip(questions, hashes):
+            if question_hash in batch_hashes:
+                continue
+            batch_hashes.add(question_hash)
+
+            payload = {**question, "hash": question_hash}
+
+            # Normalize metadata (subject, topic, subtopic) to lowercase
+            normalize_metadata(payload)
+
+            # Convert options to JSON string for JSONB column
+            if "options" in payload and isinstance(payload["options"], list):
+                payload["options"] = json.dumps(payload["options"])
+
+            pending.setdefault(tuple(payload.keys()), []).append(tuple(payload.values()))
+
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                # Stream the batch into a staging table, then move it over in one
+                # INSERT. ON CONFLICT keeps concurrent inserts of the same question
+                # from failing the batch, and the no-op update makes RETURNING
+                # report the id of rows that already existed too.
+                cur.execute(
+                    "CREATE TEMP TABLE question_bank_staging "
+                    "(LIKE question_bank INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                for columns, rows in pending.items():
+                    with cur.copy(f"COPY question_bank_staging ({', '.join(columns)}) FROM STDIN") as copy:
+                        for row in rows:
+                            copy.write_row(row)
 
-                    # Normalize metadata (subject, topic, subtopic) to lowercase
-                    normalize_metadata(payload)
+                cur.execute(
+                    """INSERT INTO question_bank SELECT * FROM question_bank_staging
+                       ON CONFLICT (hash) DO UPDATE SET hash = EXCLUDED.hash
+                       RETURNING hash, id, xmax = 0 AS inserted"""
+                )
+                ids: dict[str, str] = {}
+                inserted = 0
+                for row in cur.fetchall():
+                    ids[row["hash"]] = row["id"]
+                    inserted += row["inserted"]
+                conn.commit()
 
-                    # Convert options to JSON string for JSONB column
-                    if "options" in payload and isinstance(payload["options"], list):
-                        payload["options"] = json.dumps(payload["options"])
+        # Every copy of a question, new or not, gets its database ID
+        for question, question_hash in zip(questions, hashes):
+            question["id"] = ids[question_hash]
 
-                    columns = ", ".join(payload.keys())
-                    placeholders = ", ".join(["%s"] * len(payload))
-                    cur.execute(
-                        f"INSERT INTO question_bank ({columns}) VALUES ({placeholders})",
-                        tuple(payload.values())
-                    )
-                    print(f"[INSERT_Q] Inserted new question with id={payload['id']} topic={payload['topic']} sub_topic={payload['sub_topic']} grade={payload['grade']} difficulty={payload['difficulty']}", flush=True)
-                conn.commit()
-        finally:
-            conn.close()
+        logger.debug(
+            "[INSERT_Q] Inserted %d new questions, %d already existed",
+            inserted,
+            len(questions) - inserted,
+        )
 
     def fetch_questions(
         self,
@@ -437,15 +614,14 @@ class PostgresRepository:
         topic: str | None,
         limit: int,
     ) -> list[dict]:
-        hashes = self.list_seen_question_hashes(child_id)
-        questions = self.list_questions(
+        return self.list_questions(
             subject=subject,
             topic=topic,
             grade=None,
             difficulties=None,
-            exclude_hashes=hashes,
+            exclude_child_id=child_id,
+            limit=limit,
         )
-        return questions[:limit]
 
     def log_attempt(
         self,
@@ -455,91 +631,97 @@ class PostgresRepository:
         selected: str,
         time_spent_ms: int,
     ) -> dict:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                print(f"[LOG_ATTEMPT] Looking for question_id: {question_id}", flush=True)
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
+                logger.debug("[LOG_ATTEMPT] Looking for question_id: %s", question_id)
+                # Looks up the question, records the attempt and marks correct
+                # answers as seen in one statement; no row comes back when the
+                # question is unknown.
                 cur.execute(
-                    "SELECT correct_answer, hash FROM question_bank WHERE id = %s",
-                    (question_id,)
+                    """WITH q AS (SELECT correct_answer, hash FROM question_bank WHERE id = %s),
+                       a AS (
+                         INSERT INTO attempts (child_id, question_id, selected, correct, time_spent_ms)
+                         SELECT %s::uuid, %s::uuid, %s, COALESCE(q.correct_answer = %s, false), %s::int FROM q
+                         RETURNING id, correct
+                       ),
+                       s AS (
+                         INSERT INTO seen_questions (child_id, question_hash)
+                         SELECT %s::uuid, q.hash FROM q, a WHERE a.correct ON CONFLICT DO NOTHING
+                       )
+                       SELECT a.id, a.correct, q.correct_answer, q.hash FROM a, q""",
+                    (question_id, child_id, question_id, selected, selected, time_spent_ms, child_id)
                 )
-                question = cur.fetchone()
-                if not question:
-                    print(f"[LOG_ATTEMPT] Question not found in database: {question_id}", flush=True)
+                attempt = cur.fetchone()
+                if not attempt:
+                    logger.debug("[LOG_ATTEMPT] Question not found in database: %s", question_id)
                     raise ValueError(f"Unknown question: {question_id}")
 
-                correct_answer = question["correct_answer"]
-                correct = selected == correct_answer
+        if attempt["correct"]:
+            seen = _SEEN_HASHES_CACHE.get(child_id)
+            if seen is not None:
+                seen.add(attempt["hash"])
 
-                cur.execute(
-                    "INSERT INTO attempts (child_id, question_id, selected, correct, time_spent_ms) VALUES (%s, %s, %s, %s, %s) RETURNING id",
-                    (child_id, question_id, selected, correct, time_spent_ms)
-                )
-                attempt_id = cur.fetchone()["id"]
-
-                if correct:
-                    cur.execute(
-                        "INSERT INTO seen_questions (child_id, question_hash) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                        (child_id, question["hash"])
-                    )
-
-                conn.commit()
-
-                return {
-                    "attempt_id": attempt_id,
-                    "correct": correct,
-                    "expected": correct_answer,
-                }
-        finally:
-            conn.close()
+        return {
+            "attempt_id": attempt["id"],
+            "correct": attempt["correct"],
+            "expected": attempt["correct_answer"],
+        }
 
     def child_progress(self, child_id: str) -> dict:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor(row_factory=tuple_row) as cur:
+                # Per-subject totals in one pass; the streak is every attempt
+                # made after the child's most recent miss.
                 cur.execute(
-                    "SELECT * FROM attempts WHERE child_id = %s ORDER BY created_at",
-                    (child_id,)
+                    """WITH last_miss AS (
+                         SELECT MAX(created_at) AS created_at
+                         FROM attempts
+                         WHERE child_id = %s AND correct IS NOT TRUE
+                       )
+                       SELECT q.subject,
+                              COUNT(*) AS total,
+                              COUNT(*) FILTER (WHERE a.correct) AS correct,
+                              COUNT(*) FILTER (
+                                WHERE a.created_at > COALESCE(m.created_at, '-infinity')
+                              ) AS streak
+                       FROM attempts a
+                       LEFT JOIN question_bank q ON q.id = a.question_id
+                       CROSS JOIN last_miss m
+                       WHERE a.child_id = %s
+                       GROUP BY q.subject
+                       ORDER BY MIN(a.created_at)""",
+                    (child_id, child_id)
                 )
-                attempts = [dict(row) for row in cur.fetchall()]
+                rows = cur.fetchall()
 
-                if not attempts:
+                if not rows:
                     return {"attempted": 0, "correct": 0, "accuracy": 0, "current_streak": 0, "by_subject": {}}
 
-                total = len(attempts)
-                correct = sum(1 for attempt in attempts if attempt.get("correct"))
+                total = sum(row[1] for row in rows)
+                correct = sum(row[2] for row in rows)
+                streak = sum(row[3] for row in rows)
                 # Convert to percentage and round to integer (0-100)
                 accuracy = round((correct / total * 100)) if total else 0
 
-                streak = 0
-                for attempt in reversed(attempts):
-                    if attempt.get("correct"):
-                        streak += 1
-                    else:
-                        break
-
-                question_ids = {attempt["question_id"] for attempt in attempts}
-                placeholders = ", ".join(["%s"] * len(question_ids))
-                cur.execute(
-                    f"SELECT id, subject FROM question_bank WHERE id IN ({placeholders})",
-                    list(question_ids)
-                )
-                subject_map = {row["id"]: row["subject"] for row in cur.fetchall()}
-
-                by_subject: dict[str, dict[str, int]] = {}
-                for attempt in attempts:
-                    subject = subject_map.get(attempt["question_id"], "unknown")
+                # [correct, total] per display subject; differently-cased
+                # subjects collapse onto the same key.
+                totals: dict[str, list[int]] = {}
+                for subject, subject_total, subject_correct, _ in rows:
                     # Capitalize subject name for consistency
-                    subject = subject.capitalize() if subject else "Unknown"
-                    stats = by_subject.setdefault(subject, {"correct": 0, "total": 0})
-                    stats["total"] += 1
-                    if attempt.get("correct"):
-                        stats["correct"] += 1
-
-                for subject, stats in by_subject.items():
-                    total_subject = stats["total"]
-                    # Convert to percentage and round to integer (0-100)
-                    stats["accuracy"] = round((stats["correct"] / total_subject * 100)) if total_subject else 0
+                    key = subject.capitalize() if subject else "Unknown"
+                    counts = totals.setdefault(key, [0, 0])
+                    counts[0] += subject_correct
+                    counts[1] += subject_total
+
+                by_subject = {
+                    subject: {
+                        "correct": subject_correct,
+                        "total": subject_total,
+                        # Convert to percentage and round to integer (0-100)
+                        "accuracy": round((subject_correct / subject_total * 100)) if subject_total else 0,
+                    }
+                    for subject, (subject_correct, subject_total) in totals.items()
+                }
 
                 return {
                     "attempted": total,
@@ -548,48 +730,39 @@ class PostgresRepository:
                     "current_streak": streak,
                     "by_subject": by_subject,
                 }
-        finally:
-            conn.close()
 
 
     def insert_subtopics(self, subtopics: list[dict]) -> None:
         """Insert subtopics into the database."""
-        from ..services.text_utils import normalize_metadata
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                for subtopic in subtopics:
-                    # Normalize metadata before insertion
-                    normalized = {**subtopic}
-                    normalize_metadata(normalized)
-
-                    # Check if subtopic already exists
-                    cur.execute(
-                        "SELECT id FROM subtopics WHERE subject = %s AND grade = %s AND topic = %s AND subtopic = %s",
-                        (normalized["subject"], normalized["grade"], normalized["topic"], normalized["subtopic"])
-                    )
-                    if cur.fetchone():
-                        print(f"[INSERT_SUBTOPIC] Subtopic already exists: {normalized['subject']}/{normalized['grade']}/{normalized['topic']}/{normalized['subtopic']}", flush=True)
-                        continue
-
-                    # Insert new subtopic
-                    cur.execute(
-                        """INSERT INTO subtopics (subject, grade, topic, subtopic, description, sequence_order)
-                           VALUES (%s, %s, %s, %s, %s, %s)""",
-                        (
-                            normalized["subject"],
-                            normalized["grade"],
-                            normalized["topic"],
-                            normalized["subtopic"],
-                            normalized.get("description"),
-                            normalized.get("sequence_order", 0)
-                        )
-                    )
-                    print(f"[INSERT_SUBTOPIC] Inserted: {normalized['subject']}/{normalized['grade']}/{normalized['topic']}/{normalized['subtopic']}", flush=True)
+        # Normalize metadata before insertion; the first entry wins for each key
+        normalized_by_key: dict[tuple, dict] = {}
+        for subtopic in subtopics:
+            normalized = normalize_metadata({**subtopic})
+            key = (normalized["subject"], normalized["grade"], normalized["topic"], normalized["subtopic"])
+            normalized_by_key.setdefault(key, normalized)
+
+        if not normalized_by_key:
+            return
+
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                inserted = _execute_values(
+                    cur,
+                    """INSERT INTO subtopics (subject, grade, topic, subtopic, description, sequence_order)
+                       VALUES %s
+                       ON CONFLICT (subject, grade, topic, subtopic) DO NOTHING
+                       RETURNING id""",
+                    [
+                        (*key, normalized.get("description"), normalized.get("sequence_order", 0))
+                        for key, normalized in normalized_by_key.items()
+                    ],
+                )
                 conn.commit()
-        finally:
-            conn.close()
+                logger.debug(
+                    "[INSERT_SUBTOPIC] Inserted %d subtopics, %d already existed",
+                    len(inserted),
+                    len(subtopics) - len(inserted),
+                )
 
     def list_subtopics(
         self,
@@ -598,11 +771,8 @@ class PostgresRepository:
         topic: str | None = None,
     ) -> list[dict]:
         """List subtopics filtered by subject, grade, and/or topic."""
-        from ..services.text_utils import normalize_subject, normalize_topic
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 # Normalize inputs before querying
                 query = "SELECT * FROM subtopics WHERE subject = %s"
                 params = [normalize_subject(subject)]
@@ -617,30 +787,39 @@ class PostgresRepository:
 
                 query += " ORDER BY sequence_order, subtopic"
                 cur.execute(query, params)
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
+
+    def list_topics(self, subject: str, grade: int) -> list[str]:
+        """List distinct topics for a subject/grade, in the order list_subtopics first lists them."""
+        with _autocommit_conn() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
+                cur.execute(
+                    """
+                    SELECT topic FROM (
+                        SELECT DISTINCT ON (topic) topic, sequence_order, subtopic
+                        FROM subtopics
+                        WHERE subject = %s AND grade = %s AND topic <> ''
+                        ORDER BY topic, sequence_order, subtopic
+                    ) t
+                    ORDER BY sequence_order, subtopic
+                    """,
+                    (normalize_subject(subject), grade)
+                )
+                return cur.fetchall()
 
     def get_subtopic(self, subtopic_id: str) -> dict | None:
         """Get a single subtopic by ID."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute("SELECT * FROM subtopics WHERE id = %s", (subtopic_id,))
-                result = cur.fetchone()
-                return dict(result) if result else None
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     def count_subtopics(self, *, subject: str, grade: int | None = None, topic: str | None = None) -> int:
         """Count subtopics filtered by subject, grade, and/or topic."""
-        from ..services.text_utils import normalize_subject, normalize_topic
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
                 # Normalize inputs before querying
-                query = "SELECT COUNT(*) as count FROM subtopics WHERE subject = %s"
+                query = "SELECT COUNT(*) FROM subtopics WHERE subject = %s"
                 params = [normalize_subject(subject)]
 
                 if grade is not None:
@@ -652,9 +831,7 @@ class PostgresRepository:
                     params.append(normalize_topic(topic))
 
                 cur.execute(query, params)
-                return cur.fetchone()["count"]
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     # Session tracking methods
     def create_session(
@@ -666,11 +843,8 @@ class PostgresRepository:
         subtopic: str | None = None,
     ) -> dict:
         """Create a new practice session."""
-        from ..services.text_utils import normalize_subject, normalize_topic, normalize_subtopic
-
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 # Normalize metadata before insertion
                 normalized_subject = normalize_subject(subject) if subject else None
                 normalized_topic = normalize_topic(topic) if topic else None
@@ -682,17 +856,14 @@ class PostgresRepository:
                        RETURNING id, child_id, subject, topic, subtopic, started_at, ended_at, created_at, updated_at""",
                     (child_id, normalized_subject, normalized_topic, normalized_subtopic)
                 )
-                session = dict(cur.fetchone())
+                session = cur.fetchone()
                 conn.commit()
                 return session
-        finally:
-            conn.close()
 
     def get_active_session(self, child_id: str) -> dict | None:
         """Get the active (not ended) session for a child, if any."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """SELECT id, child_id, subject, topic, subtopic, started_at, ended_at, created_at, updated_at
                        FROM sessions
@@ -701,32 +872,24 @@ class PostgresRepository:
                        LIMIT 1""",
                     (child_id,)
                 )
-                result = cur.fetchone()
-                return dict(result) if result else None
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     def get_session(self, session_id: str) -> dict | None:
         """Get a session by ID."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """SELECT id, child_id, subject, topic, subtopic, started_at, ended_at, created_at, updated_at
                        FROM sessions
                        WHERE id = %s""",
                     (session_id,)
                 )
-                result = cur.fetchone()
-                return dict(result) if result else None
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     def end_session(self, session_id: str) -> dict:
         """End a session by setting ended_at timestamp."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """UPDATE sessions
                        SET ended_at = now()
@@ -738,15 +901,12 @@ class PostgresRepository:
                 if not result:
                     raise ValueError(f"Session not found or already ended: {session_id}")
                 conn.commit()
-                return dict(result)
-        finally:
-            conn.close()
+                return result
 
     def get_session_summary(self, session_id: str) -> dict:
         """Get summary statistics for a session."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 # Get session details
                 cur.execute(
                     """SELECT id, child_id, subject, topic, subtopic, started_at, ended_at, created_at, updated_at
@@ -757,7 +917,6 @@ class PostgresRepository:
                 if not session:
                     raise ValueError(f"Session not found: {session_id}")
 
-                session = dict(session)
 
                 # Get attempts within the session time window
                 if session["ended_at"]:
@@ -782,7 +941,7 @@ class PostgresRepository:
                         (session["child_id"], session["started_at"])
                     )
 
-                attempts = [dict(row) for row in cur.fetchall()]
+                attempts = cur.fetchall()
 
                 # Calculate statistics
                 questions_attempted = len(attempts)
@@ -791,8 +950,12 @@ class PostgresRepository:
                 total_time_ms = sum(a.get("time_spent_ms", 0) for a in attempts)
                 avg_time_per_question_ms = total_time_ms // questions_attempted if questions_attempted else 0
 
-                # Get unique subjects practiced
-                subjects_practiced = list({a["subject"].capitalize() for a in attempts if a.get("subject")})
+                # Unique subjects in first-practiced order; subjects are stored
+                # normalized, so dedupe first and capitalize each one once
+                subjects_practiced = [
+                    subject.capitalize()
+                    for subject in dict.fromkeys(a["subject"] for a in attempts if a.get("subject"))
+                ]
 
                 return {
                     "session": session,
@@ -803,8 +966,6 @@ class PostgresRepository:
                     "avg_time_per_question_ms": avg_time_per_question_ms,
                     "subjects_practiced": subjects_practiced,
                 }
-        finally:
-            conn.close()
 
 
     # Quiz Session Methods
@@ -820,28 +981,65 @@ class PostgresRepository:
         difficulty_mix: dict
     ) -> dict:
         """Create a new quiz session."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """INSERT INTO quiz_sessions
                        (child_id, subject, topic, subtopic, total_questions, duration_sec, difficulty_mix_config, status)
                        VALUES (%s, %s, %s, %s, %s, %s, %s, 'active')
                        RETURNING id, child_id, subject, topic, subtopic, status, duration_sec,
                                  difficulty_mix_config, started_at, submitted_at, score, total_questions, created_at""",
-                    (child_id, subject, topic, subtopic, question_count, duration_sec, difficulty_mix)
+                    (child_id, subject, topic, subtopic, question_count, duration_sec, Jsonb(difficulty_mix))
                 )
-                result = dict(cur.fetchone())
+                result = cur.fetchone()
+                conn.commit()
+                return result
+
+    def create_quiz_session_with_questions(
+        self, *,
+        child_id: str,
+        subject: str,
+        topic: str,
+        subtopic: str | None,
+        question_count: int,
+        duration_sec: int,
+        difficulty_mix: dict,
+        questions: list[dict],
+    ) -> dict:
+        """Create a quiz session and link its questions in a single statement."""
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """WITH sess AS (
+                           INSERT INTO quiz_sessions
+                           (child_id, subject, topic, subtopic, total_questions, duration_sec, difficulty_mix_config, status)
+                           VALUES (%s, %s, %s, %s, %s, %s, %s, 'active')
+                           RETURNING id, child_id, subject, topic, subtopic, status, duration_sec,
+                                     difficulty_mix_config, started_at, submitted_at, score, total_questions, created_at
+                       ), linked AS (
+                           INSERT INTO quiz_session_questions
+                           (quiz_session_id, question_id, index, correct_choice, explanation)
+                           SELECT sess.id, q.question_id, q.index, q.correct_choice, q.explanation
+                           FROM sess, unnest(%s::uuid[], %s::int[], %s::text[], %s::text[])
+                                AS q(question_id, index, correct_choice, explanation)
+                       )
+                       SELECT * FROM sess""",
+                    (
+                        child_id, subject, topic, subtopic, question_count, duration_sec, Jsonb(difficulty_mix),
+                        [q["question_id"] for q in questions],
+                        [q["index"] for q in questions],
+                        [q["correct_choice"] for q in questions],
+                        [q["explanation"] for q in questions],
+                    )
+                )
+                result = cur.fetchone()
                 conn.commit()
                 return result
-        finally:
-            conn.close()
 
     def get_quiz_session(self, session_id: str) -> dict | None:
         """Get a quiz session by ID."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """SELECT id, child_id, subject, topic, subtopic, status, duration_sec,
                               difficulty_mix_config, started_at, submitted_at, score, total_questions, created_at
@@ -849,16 +1047,12 @@ class PostgresRepository:
                        WHERE id = %s""",
                     (session_id,)
                 )
-                result = cur.fetchone()
-                return dict(result) if result else None
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     def list_quiz_sessions(self, child_id: str, limit: int = 20, offset: int = 0) -> list[dict]:
         """List quiz sessions for a child."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """SELECT id, child_id, subject, topic, subtopic, status, duration_sec,
                               difficulty_mix_config, started_at, submitted_at, score, total_questions, created_at
@@ -868,15 +1062,12 @@ class PostgresRepository:
                        LIMIT %s OFFSET %s""",
                     (child_id, limit, offset)
                 )
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
 
     def check_active_quiz(self, child_id: str, subject: str, topic: str) -> dict | None:
         """Check if there's an active quiz for this child/subject/topic."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """SELECT id, child_id, subject, topic, subtopic, status, duration_sec,
                               difficulty_mix_config, started_at, submitted_at, score, total_questions, created_at
@@ -885,16 +1076,12 @@ class PostgresRepository:
                        LIMIT 1""",
                     (child_id, subject, topic)
                 )
-                result = cur.fetchone()
-                return dict(result) if result else None
-        finally:
-            conn.close()
+                return cur.fetchone()
 
     def create_quiz_session_questions(self, session_id: str, questions: list[dict]) -> list[dict]:
         """Bulk insert questions for a quiz session."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 # Bulk insert
                 values = [
                     (session_id, q["question_id"], q["index"], q["correct_choice"], q["explanation"])
@@ -918,15 +1105,12 @@ class PostgresRepository:
                        ORDER BY index""",
                     (session_id,)
                 )
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
 
     def get_quiz_session_questions(self, session_id: str) -> list[dict]:
         """Get all questions for a quiz session."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _autocommit_conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """SELECT qsq.id, qsq.quiz_session_id, qsq.question_id, qsq.index,
                               qsq.correct_choice, qsq.explanation, qsq.selected_choice, qsq.is_correct,
@@ -937,24 +1121,24 @@ class PostgresRepository:
                        ORDER BY qsq.index""",
                     (session_id,)
                 )
-                return [dict(row) for row in cur.fetchall()]
-        finally:
-            conn.close()
+                return cur.fetchall()
 
     def submit_quiz_session(self, session_id: str, answers: list[dict]) -> dict:
         """Submit quiz answers and calculate score."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Update each question with selected answer and correctness
-                for answer in answers:
-                    cur.execute(
-                        """UPDATE quiz_session_questions
-                           SET selected_choice = %s,
-                               is_correct = (correct_choice = %s)
-                           WHERE quiz_session_id = %s AND question_id = %s""",
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                # Update each question with selected answer and correctness;
+                # executemany pipelines the updates instead of waiting on each.
+                cur.executemany(
+                    """UPDATE quiz_session_questions
+                       SET selected_choice = %s,
+                           is_correct = (correct_choice = %s)
+                       WHERE quiz_session_id = %s AND question_id = %s""",
+                    [
                         (answer["selected_choice"], answer["selected_choice"], session_id, answer["question_id"])
-                    )
+                        for answer in answers
+                    ]
+                )
 
                 # Calculate score
                 cur.execute(
@@ -965,7 +1149,7 @@ class PostgresRepository:
                        WHERE quiz_session_id = %s""",
                     (session_id,)
                 )
-                counts = dict(cur.fetchone())
+                counts = cur.fetchone()
                 score = round((counts["correct"] / counts["total"] * 100)) if counts["total"] else 0
 
                 # Update session with score and status
@@ -979,17 +1163,14 @@ class PostgresRepository:
                                  difficulty_mix_config, started_at, submitted_at, score, total_questions, created_at""",
                     (score, session_id)
                 )
-                result = dict(cur.fetchone())
+                result = cur.fetchone()
                 conn.commit()
                 return result
-        finally:
-            conn.close()
 
     def expire_quiz_session(self, session_id: str) -> dict | None:
         """Mark a quiz session as expired."""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with _conn() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """UPDATE quiz_sessions
                        SET status = 'expired'
@@ -1001,10 +1182,8 @@ class PostgresRepository:
                 result = cur.fetchone()
                 if result:
                     conn.commit()
-                    return dict(result)
+                    return result
                 return None
-        finally:
-            conn.close()
 
 
 def build_postgres_repository() -> PostgresRepository:
@@ -32,6 +32,8 @@ class Repository(Protocol):
 
     def get_child(self, child_id: str) -> dict | None: ...
 
+    def get_child_for_parent(self, child_id: str, parent_id: str) -> dict | None: ...
+
     def list_children(self, parent_id: str) -> list[dict]: ...
 
     def create_child(self, parent_id: str, payload: dict) -> dict: ...
@@ -42,6 +44,8 @@ class Repository(Protocol):
 
     def list_standards(self) -> list[dict]: ...
 
+    def find_standards(self, *, subject: str | None = None, grade: int | None = None) -> list[dict]: ...
+
     def insert_standard(self, subject: str, grade: int, domain: str, sub_domain: str,
                        standard_ref: str, title: str, description: str) -> None: ...
 
@@ -58,6 +62,7 @@ class Repository(Protocol):
         subtopic: str | None = None,
         difficulties: Iterable[str] | None = None,
         exclude_hashes: Iterable[str] | None = None,
+        limit: int | None = None,
     ) -> list[dict]: ...
 
     def count_questions(
@@ -95,6 +100,8 @@ class Repository(Protocol):
         topic: str | None = None,
     ) -> list[dict]: ...
 
+    def list_topics(self, subject: str, grade: int) -> list[str]: ...
+
     def get_subtopic(self, subtopic_id: str) -> dict | None: ...
 
     def count_subtopics(self, *, subject: str, grade: int | None = None, topic: str | None = None) -> int: ...
@@ -123,20 +130,20 @@ def build_repository() -> Repository:
     logger = logging.getLogger(__name__)
 
     mode = os.getenv("STUDYBUDDY_DATA_MODE", "memory").lower()
-    logger.warning(f"Building repository with mode: {mode}")
+    logger.info("Building repository with mode: %s", mode)
 
     if mode == "supabase":
         if build_postgres_repository is None:
-            raise RuntimeError("PostgreSQL dependencies (psycopg2) are not installed")
+            raise RuntimeError("PostgreSQL dependencies (psycopg, psycopg_pool) are not installed")
         try:
             repo = build_postgres_repository()
-            logger.warning(f"Successfully initialized PostgreSQL repository!")
+            logger.info("Successfully initialized PostgreSQL repository")
             return repo
         except Exception as e:
-            logger.error(f"Failed to initialize PostgreSQL repository: {e}. Falling back to memory mode.")
+            logger.error("Failed to initialize PostgreSQL repository: %s. Falling back to memory mode.", e)
             return build_memory_repository()
 
-    logger.warning(f"Using memory repository")
+    logger.info("Using memory repository")
     return build_memory_repository()
 
 
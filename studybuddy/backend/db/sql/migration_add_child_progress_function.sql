@@ -0,0 +1,53 @@
+-- Migration: Add child_progress() for server-side progress aggregation
+-- Description: Totals, per-subject stats and current streak for one child,
+--              returned as a single JSON object (called via PostgREST RPC)
+-- Created: 2026-10-15
+
+-- Shape matches SupabaseRepository.child_progress: accuracy is an integer
+-- percentage (0-100) and attempts without a question subject count under 'unknown'. The streak
+-- is the number of attempts made after the child's most recent miss.
+-- SECURITY INVOKER (the default) keeps row level security in force for
+-- callers other than the service role.
+CREATE OR REPLACE FUNCTION child_progress(p_child_id uuid)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+  WITH a AS (
+    SELECT a.correct, a.created_at, COALESCE(q.subject, 'unknown') AS subject
+    FROM attempts a
+    LEFT JOIN question_bank q ON q.id = a.question_id
+    WHERE a.child_id = p_child_id
+  ),
+  last_miss AS (
+    SELECT MAX(created_at) AS created_at FROM a WHERE correct IS NOT TRUE
+  ),
+  subjects AS (
+    SELECT subject, COUNT(*) FILTER (WHERE correct) AS correct, COUNT(*) AS total
+    FROM a
+    GROUP BY subject
+  ),
+  totals AS (
+    SELECT COUNT(*) AS attempted, COUNT(*) FILTER (WHERE correct) AS correct FROM a
+  )
+  SELECT json_build_object(
+    'attempted', t.attempted,
+    'correct', t.correct,
+    'accuracy', COALESCE(ROUND(t.correct * 100.0 / NULLIF(t.attempted, 0))::int, 0),
+    'current_streak', (
+      SELECT COUNT(*) FROM a, last_miss m
+      WHERE a.created_at > COALESCE(m.created_at, '-infinity')
+    ),
+    'by_subject', COALESCE(
+      (
+        SELECT json_object_agg(
+          s.subject,
+          json_build_object('correct', s.correct, 'total', s.total, 'accuracy', ROUND(s.correct * 100.0 / s.total)::int)
+        )
+        FROM subjects s
+      ),
+      '{}'::json
+    )
+  )
+  FROM totals t;
+$$;
@@ -0,0 +1,46 @@
+-- Migration: Add signup_parent() and login_parent() for single round-trip auth
+-- Description: Create or verify a parent and issue its token in one call,
+--              for SupabaseRepository.create_parent / authenticate_parent
+-- Created: 2026-10-15
+
+-- Both functions take the password hash and token computed by
+-- services/security.py and return the parent as a JSON object, or NULL when
+-- the email is already registered (signup) or the credentials don't match
+-- (login). The unique constraint on parents.email decides signup conflicts,
+-- so no preliminary lookup is needed.
+CREATE OR REPLACE FUNCTION signup_parent(p_email text, p_password_hash text, p_token text)
+RETURNS json
+LANGUAGE sql
+AS $$
+  WITH p AS (
+    INSERT INTO parents (email, password_hash)
+    VALUES (p_email, p_password_hash)
+    ON CONFLICT (email) DO NOTHING
+    RETURNING id, email, created_at
+  ),
+  t AS (
+    INSERT INTO parent_tokens (token, parent_id)
+    SELECT p_token, id FROM p
+  )
+  SELECT json_build_object('id', p.id, 'email', p.email, 'created_at', p.created_at)
+  FROM p;
+$$;
+
+-- password_hash is an unsalted digest, so comparing it here is equivalent to
+-- verify_password() and the token is only issued on a match.
+CREATE OR REPLACE FUNCTION login_parent(p_email text, p_password_hash text, p_token text)
+RETURNS json
+LANGUAGE sql
+AS $$
+  WITH p AS (
+    SELECT id, email, created_at
+    FROM parents
+    WHERE email = p_email AND password_hash = p_password_hash
+  ),
+  t AS (
+    INSERT INTO parent_tokens (token, parent_id)
+    SELECT p_token, id FROM p
+  )
+  SELECT json_build_object('id', p.id, 'email', p.email, 'created_at', p.created_at)
+  FROM p;
+$$;
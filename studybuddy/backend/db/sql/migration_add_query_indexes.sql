@@ -0,0 +1,24 @@
+-- Migration: Add indexes for the repository's hot read paths
+-- Description: Covering indexes for the Postgres repository's query shapes
+-- Created: 2026-10-15
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so each
+-- statement is applied separately with autocommit
+-- (see scripts/apply_query_indexes_migration.py).
+--
+-- Already covered by constraints/indexes in schema.sql:
+--   parent_tokens(token)                        primary key
+--   seen_questions(child_id, question_hash)     primary key
+--   question_bank(hash)                         unique
+--   subtopics(subject, grade, topic, subtopic)  unique
+--   attempts(child_id, created_at desc)         idx_attempts_child_created
+
+-- list_questions / count_questions filter on subject, topic, sub_topic and
+-- grade. difficulty, hash and source are included so the remaining filters
+-- and the seen-question anti-join can be answered from the index.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_question_bank_filter
+  ON question_bank(subject, topic, sub_topic, grade) INCLUDE (difficulty, hash, source);
+
+-- list_children: WHERE parent_id = ? ORDER BY created_at
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_children_parent_created
+  ON children(parent_id, created_at);
@@ -0,0 +1,54 @@
+-- Migration: Add unseen_questions() for server-side seen-question filtering
+-- Description: Questions matching the fetch filters that a child has not yet
+--              seen, for SupabaseRepository.fetch_questions (PostgREST RPC)
+-- Created: 2026-10-15
+
+-- The anti-join against seen_questions uses its (child_id, question_hash)
+-- primary key, so the request size no longer grows with the child's history.
+-- Filters left NULL are not applied. grade also matches questions with no
+-- grade, as in SupabaseRepository.list_questions.
+-- Only the columns SupabaseRepository selects elsewhere are returned (no image
+-- bytea). The return type changed from SETOF question_bank, which CREATE OR
+-- REPLACE cannot do, hence the DROP.
+DROP FUNCTION IF EXISTS unseen_questions(uuid, text, text, int, text[]);
+
+CREATE FUNCTION unseen_questions(
+  p_child_id uuid,
+  p_subject text,
+  p_topic text DEFAULT NULL,
+  p_grade int DEFAULT NULL,
+  p_difficulties text[] DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  standard_ref text,
+  subject text,
+  grade int,
+  topic text,
+  sub_topic text,
+  difficulty text,
+  stem text,
+  options jsonb,
+  correct_answer text,
+  rationale text,
+  source text,
+  hash text,
+  created_at timestamptz
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT qb.id, qb.standard_ref, qb.subject, qb.grade, qb.topic, qb.sub_topic,
+         qb.difficulty, qb.stem, qb.options, qb.correct_answer, qb.rationale,
+         qb.source, qb.hash, qb.created_at
+  FROM question_bank qb
+  WHERE qb.subject = p_subject
+    AND (p_topic IS NULL OR qb.topic = p_topic)
+    AND (p_grade IS NULL OR qb.grade = p_grade OR qb.grade IS NULL)
+    AND (p_difficulties IS NULL OR qb.difficulty = ANY(p_difficulties))
+    AND NOT EXISTS (
+      SELECT 1 FROM seen_questions s
+      WHERE s.child_id = p_child_id AND s.question_hash = qb.hash
+    )
+  ORDER BY qb.created_at;
+$$;
@@ -93,3 +93,5 @@ create index if not exists idx_attempts_child_created on attempts(child_id, crea
 create index if not exists idx_question_bank_standard on question_bank(standard_ref);
 create index if not exists idx_subtopics_lookup on subtopics(subject, grade, topic);
 create index if not exists idx_question_bank_subtopic on question_bank(subject, grade, topic, sub_topic);
+create index if not exists idx_question_bank_filter on question_bank(subject, topic, sub_topic, grade) include (difficulty, hash, source);
+create index if not exists idx_children_parent_created on children(parent_id, created_at);
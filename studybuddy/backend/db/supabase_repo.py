@@ -7,7 +7,16 @@ from typing import Iterable
 from supabase import Client, create_client
 
 from ..services.hashing import hash_question
-from ..services.security import generate_token, hash_password, verify_password
+from ..services.security import generate_token, hash_password
+
+# Explicit projections: only the columns the API returns, so wider tables
+# (and the question image bytea) don't ride along on every list call.
+_CHILD_COLUMNS = "id,parent_id,name,birthdate,grade,zip,created_at"
+_ATTEMPT_COLUMNS = "id,child_id,question_id,selected,correct,time_spent_ms,created_at"
+_QUESTION_COLUMNS = (
+    "id,standard_ref,subject,grade,topic,sub_topic,difficulty,stem,options,"
+    "correct_answer,rationale,source,hash,created_at"
+)
 
 
 def _client() -> Client:
@@ -27,37 +36,26 @@ class SupabaseRepository:
     # ------------------------------------------------------------------
     # Parent authentication
     def create_parent(self, *, email: str, password: str) -> dict:
-        existing = self.client.table("parents").select("id").eq("email", email).execute()
-        if existing.data:
-            raise ValueError("Parent already exists")
-        password_hash = hash_password(password)
-        inserted = (
-            self.client.table("parents")
-            .insert({"email": email, "password_hash": password_hash})
-            .execute()
-        )
-        parent = inserted.data[0]
+        # signup_parent() inserts the parent and its token in one round trip
+        # (see db/sql/migration_add_parent_auth_functions.sql)
         token = generate_token()
-        self.client.table("parent_tokens").insert({"token": token, "parent_id": parent["id"]}).execute()
-        parent.pop("password_hash", None)
-        return {"parent": parent, "token": token}
+        res = self.client.rpc(
+            "signup_parent",
+            {"p_email": email, "p_password_hash": hash_password(password), "p_token": token},
+        ).execute()
+        if not res.data:
+            raise ValueError("Parent already exists")
+        return {"parent": res.data, "token": token}
 
     def authenticate_parent(self, *, email: str, password: str) -> dict:
-        result = (
-            self.client
-            .table("parents")
-            .select("id,email,password_hash,created_at")
-            .eq("email", email)
-            .single()
-            .execute()
-        )
-        parent = result.data
-        if parent is None or not verify_password(password, parent.get("password_hash", "")):
-            raise ValueError("Invalid credentials")
         token = generate_token()
-        self.client.table("parent_tokens").insert({"token": token, "parent_id": parent["id"]}).execute()
-        parent.pop("password_hash", None)
-        return {"parent": parent, "token": token}
+        res = self.client.rpc(
+            "login_parent",
+            {"p_email": email, "p_password_hash": hash_password(password), "p_token": token},
+        ).execute()
+        if not res.data:
+            raise ValueError("Invalid credentials")
+        return {"parent": res.data, "token": token}
 
     def get_parent_by_token(self, token: str):
         result = (
@@ -102,8 +100,19 @@ class SupabaseRepository:
     def get_child(self, child_id: str) -> dict | None:
         res = (
             self.client.table("children")
-            .select("*")
+            .select(_CHILD_COLUMNS)
+            .eq("id", child_id)
+            .maybe_single()
+            .execute()
+        )
+        return res.data
+
+    def get_child_for_parent(self, child_id: str, parent_id: str) -> dict | None:
+        res = (
+            self.client.table("children")
+            .select(_CHILD_COLUMNS)
             .eq("id", child_id)
+            .eq("parent_id", parent_id)
             .maybe_single()
             .execute()
         )
@@ -112,7 +121,7 @@ class SupabaseRepository:
     def list_children(self, parent_id: str) -> list[dict]:
         res = (
             self.client.table("children")
-            .select("*")
+            .select(_CHILD_COLUMNS)
             .eq("parent_id", parent_id)
             .order("created_at")
             .execute()
@@ -128,7 +137,7 @@ class SupabaseRepository:
         if not payload:
             result = (
                 self.client.table("children")
-                .select("*")
+                .select(_CHILD_COLUMNS)
                 .eq("id", child_id)
                 .single()
                 .execute()
@@ -147,11 +156,10 @@ class SupabaseRepository:
         return updated.data[0]
 
     def delete_child(self, child_id: str) -> None:
+        # attempts, seen_questions and sessions cascade from children
         response = self.client.table("children").delete().eq("id", child_id).execute()
         if response.data is not None and not response.data:
             raise ValueError("Child not found")
-        self.client.table("attempts").delete().eq("child_id", child_id).execute()
-        self.client.table("seen_questions").delete().eq("child_id", child_id).execute()
 
     # ------------------------------------------------------------------
     # Standards & questions
@@ -159,10 +167,19 @@ class SupabaseRepository:
         res = self.client.table("standards").select("*").order("grade").execute()
         return res.data or []
 
+    def find_standards(self, *, subject: str | None = None, grade: int | None = None) -> list[dict]:
+        wanted = subject.casefold() if subject is not None else None
+        return [
+            standard
+            for standard in self.list_standards()
+            if (wanted is None or (standard.get("subject") or "").casefold() == wanted)
+            and (grade is None or standard.get("grade") == grade)
+        ]
+
     def list_child_attempts(self, child_id: str) -> list[dict]:
         res = (
             self.client.table("attempts")
-            .select("*")
+            .select(_ATTEMPT_COLUMNS)
             .eq("child_id", child_id)
             .order("created_at")
             .execute()
@@ -186,8 +203,9 @@ class SupabaseRepository:
         grade: int | None = None,
         difficulties: Iterable[str] | None = None,
         exclude_hashes: Iterable[str] | None = None,
+        limit: int | None = None,
     ) -> list[dict]:
-        query = self.client.table("question_bank").select("*").eq("subject", subject)
+        query = self.client.table("question_bank").select(_QUESTION_COLUMNS).eq("subject", subject)
         if topic:
             query = query.eq("topic", topic)
         if grade is not None:
@@ -200,7 +218,10 @@ class SupabaseRepository:
             hashes = [h for h in exclude_hashes]
             if hashes:
                 query = query.not_.in_("hash", hashes)
-        res = query.order("created_at").execute()
+        query = query.order("created_at")
+        if limit is not None:
+            query = query.limit(limit)
+        res = query.execute()
         return res.data or []
 
     def count_questions(
@@ -219,23 +240,31 @@ class SupabaseRepository:
         return res.count or 0
 
     def insert_questions(self, questions: list[dict]) -> None:
+        # Rows are grouped by key set so each group is one bulk upsert; the
+        # first copy of a question in the batch wins.
+        pending: dict[tuple[str, ...], list[dict]] = {}
+        batch_hashes: set[str] = set()
         for question in questions:
             options = question["options"]
             answer = question["correct_answer"]
             stem = question["stem"]
             question_hash = question.get("hash") or hash_question(stem, options, answer)
-            existing = (
+            if question_hash in batch_hashes:
+                continue
+            batch_hashes.add(question_hash)
+            # question_bank.id defaults to uuid_generate_v4(), so rows without
+            # an id are left for the database to fill in
+            payload = {**question, "hash": question_hash}
+            pending.setdefault(tuple(payload), []).append(payload)
+
+        # ON CONFLICT (hash) DO NOTHING skips questions that are already stored,
+        # so no per-question existence check is needed.
+        for rows in pending.values():
+            (
                 self.client.table("question_bank")
-                .select("id")
-                .eq("hash", question_hash)
-                .maybe_single()
+                .upsert(rows, on_conflict="hash", ignore_duplicates=True)
                 .execute()
             )
-            if existing.data:
-                continue
-            payload = {**question, "hash": question_hash}
-            payload.setdefault("id", os.urandom(16).hex())
-            self.client.table("question_bank").insert(payload).execute()
 
     # ------------------------------------------------------------------
     # Compatibility helpers for existing API
@@ -247,15 +276,17 @@ class SupabaseRepository:
         topic: str | None,
         limit: int,
     ) -> list[dict]:
-        hashes = self.list_seen_question_hashes(child_id)
-        questions = self.list_questions(
-            subject=subject,
-            topic=topic,
-            grade=None,
-            difficulties=None,
-            exclude_hashes=hashes,
+        # unseen_questions() filters out seen questions with a server-side
+        # anti-join (see db/sql/migration_add_unseen_questions_function.sql)
+        res = (
+            self.client.rpc(
+                "unseen_questions",
+                {"p_child_id": child_id, "p_subject": subject, "p_topic": topic or None},
+            )
+            .limit(limit)
+            .execute()
         )
-        return questions[:limit]
+        return res.data or []
 
     def log_attempt(
         self,
@@ -302,43 +333,10 @@ class SupabaseRepository:
         }
 
     def child_progress(self, child_id: str) -> dict:
-        attempts = self.list_child_attempts(child_id)
-        if not attempts:
-            return {"attempted": 0, "correct": 0, "accuracy": 0.0, "current_streak": 0, "by_subject": {}}
-        total = len(attempts)
-        correct = sum(1 for attempt in attempts if attempt.get("correct"))
-        accuracy = correct / total if total else 0.0
-        streak = 0
-        for attempt in reversed(attempts):
-            if attempt.get("correct"):
-                streak += 1
-            else:
-                break
-        by_subject: dict[str, dict[str, float]] = {}
-        question_ids = {attempt["question_id"] for attempt in attempts}
-        question_rows = (
-            self.client.table("question_bank")
-            .select("id,subject")
-            .in_("id", list(question_ids))
-            .execute()
-        ).data or []
-        subject_map = {row["id"]: row["subject"] for row in question_rows}
-        for attempt in attempts:
-            subject = subject_map.get(attempt["question_id"], "unknown")
-            stats = by_subject.setdefault(subject, {"correct": 0, "total": 0})
-            stats["total"] += 1
-            if attempt.get("correct"):
-                stats["correct"] += 1
-        for subject, stats in by_subject.items():
-            total_subject = stats["total"]
-            stats["accuracy"] = stats["correct"] / total_subject if total_subject else 0.0
-        return {
-            "attempted": total,
-            "correct": correct,
-            "accuracy": accuracy,
-            "current_streak": streak,
-            "by_subject": by_subject,
-        }
+        # Aggregated in Postgres by child_progress()
+        # (see db/sql/migration_add_child_progress_function.sql)
+        res = self.client.rpc("child_progress", {"p_child_id": child_id}).execute()
+        return res.data or {"attempted": 0, "correct": 0, "accuracy": 0, "current_streak": 0, "by_subject": {}}
 
 
 def build_supabase_repository() -> SupabaseRepository:
@@ -25,13 +25,19 @@ def get_current_parent(
 ) -> Parent:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
-    token = credentials.credentials
-    parent = repo.get_parent_by_token(token)
+    parent = repo.get_parent_by_token(credentials.credentials)
     if parent is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     return Parent(**parent)
 
 
+@lru_cache(maxsize=1)
+def _quiz_mode_enabled() -> bool:
+    # Read on first use rather than at import, since app.py loads .env after
+    # importing this module; changing the flag needs a restart.
+    return os.getenv("STUDYBUDDY_QUIZ_MODE_ENABLED", "1").lower() in ("1", "true", "yes")
+
+
 def check_quiz_mode_enabled() -> None:
     """
     Check if quiz mode is enabled via feature flag.
@@ -39,8 +45,7 @@ def check_quiz_mode_enabled() -> None:
     Raises HTTPException if quiz mode is disabled.
     Set STUDYBUDDY_QUIZ_MODE_ENABLED=1 to enable.
     """
-    enabled = os.getenv("STUDYBUDDY_QUIZ_MODE_ENABLED", "1").lower() in ("1", "true", "yes")
-    if not enabled:
+    if not _quiz_mode_enabled():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Quiz mode is currently disabled"
@@ -49,3 +54,4 @@ def check_quiz_mode_enabled() -> None:
 
 def reset_repository_cache() -> None:
     get_repository.cache_clear()  # type: ignore[attr-defined]
+    _quiz_mode_enabled.cache_clear()  # type: ignore[attr-defined]
@@ -1,42 +1,41 @@
 """Pydantic schemas for request/response bodies."""
 from __future__ import annotations
 
-import re
 from datetime import date, datetime
-from typing import Literal, Optional
+from functools import lru_cache
+from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
-
-
-EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, model_validator
 
 
+# Auth requests tend to repeat the same addresses (retries, re-logins), so
+# valid results are memoized; invalid ones raise and are never cached.
+@lru_cache(maxsize=4096)
 def _validate_email(value: str) -> str:
-    if not EMAIL_PATTERN.fullmatch(value):
+    # Same rule as ^[^@\s]+@[^@\s]+\.[^@\s]+$ using plain str operations:
+    # exactly one "@", a non-empty local part, a dot inside the domain and
+    # no whitespace anywhere.
+    local, at, domain = value.partition("@")
+    if not (at and local and "@" not in domain and "." in domain[1:-1] and value.split() == [value]):
         raise ValueError("Invalid email address")
     return value
 
 
+Email = Annotated[str, AfterValidator(_validate_email)]
+
+
 class Parent(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
-    email: str
+    email: Email
     created_at: datetime
 
-    @field_validator("email")
-    @classmethod
-    def _check_email(cls, value: str) -> str:
-        return _validate_email(value)
-
 
 class AuthRequest(BaseModel):
-    email: str
+    email: Email
     password: str = Field(min_length=6)
 
-    @field_validator("email")
-    @classmethod
-    def _check_email(cls, value: str) -> str:
-        return _validate_email(value)
-
 
 class AuthResponse(BaseModel):
     access_token: str
@@ -63,6 +62,8 @@ class ChildUpdate(BaseModel):
 
 
 class Child(ChildBase):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     parent_id: str
     created_at: datetime
@@ -77,6 +78,8 @@ class QuestionRequest(BaseModel):
 
 
 class Question(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     standard_ref: Optional[str] = None
     subject: str
@@ -106,18 +109,24 @@ class AttemptSubmission(BaseModel):
 
 
 class AttemptResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     attempt_id: str
     correct: bool
     expected: str
 
 
 class SubjectBreakdown(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     correct: int
     total: int
     accuracy: int  # Percentage 0-100
 
 
 class ProgressResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     attempted: int
     correct: int
     accuracy: int  # Percentage 0-100
@@ -150,6 +159,8 @@ class SessionSummary(BaseModel):
 
 
 class Standard(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     subject: str
     grade: int
     domain: Optional[str]
@@ -175,17 +186,13 @@ class DifficultyMix(BaseModel):
     medium: float = Field(default=0.5, ge=0, le=1)
     hard: float = Field(default=0.2, ge=0, le=1)
 
-    @field_validator("hard")
-    @classmethod
-    def _validate_sum(cls, value: float, info) -> float:
+    @model_validator(mode="after")
+    def _validate_sum(self) -> DifficultyMix:
         """Ensure difficulty proportions sum to 1.0."""
-        if hasattr(info, 'data'):
-            easy = info.data.get('easy', 0.3)
-            medium = info.data.get('medium', 0.5)
-            total = easy + medium + value
-            if not (0.99 <= total <= 1.01):  # Allow small floating point error
-                raise ValueError("Difficulty mix proportions must sum to 1.0")
-        return value
+        total = self.easy + self.medium + self.hard
+        if not (0.99 <= total <= 1.01):  # Allow small floating point error
+            raise ValueError("Difficulty mix proportions must sum to 1.0")
+        return self
 
 
 class QuizCreateRequest(BaseModel):
@@ -230,6 +237,8 @@ class QuizSession(BaseModel):
 
 class QuizQuestionDisplay(BaseModel):
     """Question displayed to user during quiz (no answers/explanations)."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     index: int
     stem: str
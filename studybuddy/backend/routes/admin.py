@@ -1,5 +1,7 @@
 """Admin endpoints for pre-generating questions."""
+import hmac
 import os
+from functools import lru_cache
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 
@@ -11,14 +13,21 @@ from ..services.genai import GenerationContext, generate_mcqs
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
+def _admin_token() -> str | None:
+    # Read on first use rather than at import, since app.py loads .env after
+    # importing the routers; rotating the token needs a restart.
+    return os.getenv("STUDYBUDDY_ADMIN_TOKEN")
+
+
 @router.post("/generate")
 def admin_generate_questions(
     payload: AdminGenerateRequest,
     admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
     repo: Repository = Depends(deps.get_repository),
 ) -> dict:
-    expected = os.getenv("STUDYBUDDY_ADMIN_TOKEN")
-    if expected and admin_token != expected:
+    expected = _admin_token()
+    if expected and not (admin_token and hmac.compare_digest(admin_token.encode(), expected.encode())):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
 
     ctx = GenerationContext(
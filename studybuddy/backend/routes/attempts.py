@@ -1,10 +1,14 @@
 """Attempt logging routes."""
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from .. import deps
 from ..db.repository import Repository
 from ..models import AttemptResult, AttemptSubmission, Parent
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -24,6 +28,6 @@ def submit_attempt(
             time_spent_ms=payload.time_spent_ms,
         )
     except ValueError as exc:
-        print(f"[ATTEMPTS] ValueError: {exc}", flush=True)
+        logger.debug("[ATTEMPTS] ValueError: %s", exc)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     return AttemptResult(**result)
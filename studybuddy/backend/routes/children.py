@@ -1,11 +1,17 @@
 """Children management routes."""
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 
 from .. import deps
 from ..db.repository import Repository
 from ..models import Child, ChildCreate, ChildUpdate, Parent
 
-router = APIRouter()
+# List responses are encoded with orjson rather than the stdlib json module
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Validates a whole list of child rows in one call instead of one model per row
+_CHILDREN_ADAPTER = TypeAdapter(list[Child])
 
 
 @router.get("/", response_model=list[Child])
@@ -13,8 +19,7 @@ def list_children(
     parent: Parent = Depends(deps.get_current_parent),
     repo: Repository = Depends(deps.get_repository),
 ) -> list[Child]:
-    children = repo.list_children(parent.id)
-    return [Child(**child) for child in children]
+    return _CHILDREN_ADAPTER.validate_python(repo.list_children(parent.id))
 
 
 @router.post("/", response_model=Child, status_code=status.HTTP_201_CREATED)
@@ -23,7 +28,8 @@ def create_child(
     parent: Parent = Depends(deps.get_current_parent),
     repo: Repository = Depends(deps.get_repository),
 ) -> Child:
-    record = repo.create_child(parent.id, payload.model_dump())
+    # ChildCreate is flat, so its field dict is what model_dump() would build
+    record = repo.create_child(parent.id, dict(payload.__dict__))
     return Child(**record)
 
 
@@ -36,9 +42,8 @@ def update_child(
 ) -> Child:
     if not repo.child_belongs_to_parent(child_id, parent.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Child mismatch")
-    update_payload = payload.model_dump(exclude_unset=True)
-    if "birthdate" in update_payload and update_payload["birthdate"]:
-        update_payload["birthdate"] = str(update_payload["birthdate"])
+    # JSON mode already renders birthdate as an ISO date string
+    update_payload = payload.model_dump(mode="json", exclude_unset=True)
     try:
         record = repo.update_child(child_id, update_payload)
     except ValueError as exc:
@@ -1,5 +1,8 @@
 """Question retrieval routes."""
+import logging
+
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 
 from .. import deps
 from ..db.repository import Repository
@@ -8,7 +11,10 @@ from ..services import pacing
 from ..services import question_picker as picker
 from ..services.text_utils import to_display_case
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# List responses are encoded with orjson rather than the stdlib json module
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/topics")
@@ -19,20 +25,9 @@ def list_topics(
     repo: Repository = Depends(deps.get_repository),
 ):
     """List available topics for a given subject/grade combination."""
-    # Get all subtopics and extract unique topics
-    subtopics = repo.list_subtopics(subject=subject, grade=grade, topic=None)
-
-    # Extract unique topics while preserving order
-    seen = set()
-    topics = []
-    for st in subtopics:
-        topic = st.get("topic")
-        if topic and topic not in seen:
-            seen.add(topic)
-            # Format for display (Title Case)
-            topics.append({"topic": to_display_case(topic)})
-
-    return {"topics": topics}
+    # Distinct topics come straight from the repository; format for display (Title Case)
+    topics = repo.list_topics(subject, grade)
+    return {"topics": [{"topic": to_display_case(topic)} for topic in topics]}
 
 
 @router.get("/subtopics")
@@ -58,18 +53,16 @@ def list_subtopics(
     return {"subtopics": subtopics}
 
 
-@router.post("/fetch", response_model=QuestionResponse)
+@router.post("/fetch", response_model=None, responses={200: {"model": QuestionResponse}})
 def fetch_questions(
     payload: QuestionRequest,
     background_tasks: BackgroundTasks,
     parent: Parent = Depends(deps.get_current_parent),
     repo: Repository = Depends(deps.get_repository),
-) -> QuestionResponse:
-    if not repo.child_belongs_to_parent(payload.child_id, parent.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Child mismatch")
-    child = repo.get_child(payload.child_id)
+) -> ORJSONResponse:
+    child = repo.get_child_for_parent(payload.child_id, parent.id)
     if not child:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Child mismatch")
 
     topic = payload.topic
     if not topic:
@@ -83,9 +76,9 @@ def fetch_questions(
     # CONDITIONAL subtopic selection
     subtopic = payload.subtopic
     if subtopic:
-        print(f"[ROUTE] Using user-specified subtopic: {subtopic}", flush=True)
+        logger.debug("[ROUTE] Using user-specified subtopic: %s", subtopic)
     else:
-        print(f"[ROUTE] No subtopic specified, will auto-select", flush=True)
+        logger.debug("[ROUTE] No subtopic specified, will auto-select")
 
     batch = picker.fetch_batch(
         repo=repo,
@@ -106,9 +99,9 @@ def fetch_questions(
             topic=topic,
             subtopic=batch.selected_subtopic,
         )
-        print(f"[SESSION] Created new session {active_session['id']} for child {payload.child_id}", flush=True)
+        logger.debug("[SESSION] Created new session %s for child %s", active_session["id"], payload.child_id)
     else:
-        print(f"[SESSION] Using existing session {active_session['id']} for child {payload.child_id}", flush=True)
+        logger.debug("[SESSION] Using existing session %s for child %s", active_session["id"], payload.child_id)
 
     # CRITICAL: Restock the SPECIFIC subtopic that was used
     if batch.stock_deficit > 0:
@@ -122,8 +115,11 @@ def fetch_questions(
             count=batch.stock_deficit,
         )
 
-    return QuestionResponse(
+    # Validated once here (which also drops repository-only columns); returning
+    # the dumped payload skips FastAPI re-validating it against a response_model
+    response = QuestionResponse(
         questions=batch.questions,
         selected_subtopic=to_display_case(batch.selected_subtopic) if batch.selected_subtopic else None,  # Format for display
         session_id=active_session.get("id")  # Return session ID to frontend
     )
+    return ORJSONResponse(response.model_dump(mode="json"))
@@ -46,8 +46,9 @@ def create_quiz_session(
     """
     logger.info(f"[QUIZ] Creating quiz for child {payload.child_id}, subject {payload.subject}, topic {payload.topic}")
 
-    # Validate child belongs to parent
-    if not repo.child_belongs_to_parent(payload.child_id, parent.id):
+    # Validate child belongs to parent (and load it for the grade below)
+    child = repo.get_child_for_parent(payload.child_id, parent.id)
+    if not child:
         logger.warning(f"[QUIZ] Auth failed: child {payload.child_id} doesn't belong to parent {parent.id}")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Child does not belong to parent")
 
@@ -60,11 +61,6 @@ def create_quiz_session(
             detail=f"Active quiz already exists for this child/subject/topic: {active_quiz['id']}"
         )
 
-    # Get child details
-    child = repo.get_child(payload.child_id)
-    if not child:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-
     grade = child.get("grade")
 
     # Prepare difficulty mix
@@ -93,20 +89,6 @@ def create_quiz_session(
 
     questions = selection_result.questions
 
-    # Create quiz session
-    session = repo.create_quiz_session(
-        child_id=payload.child_id,
-        subject=payload.subject,
-        topic=payload.topic,
-        subtopic=payload.subtopic,
-        question_count=payload.question_count,
-        duration_sec=payload.duration_sec,
-        difficulty_mix=mix_dict
-    )
-
-    logger.info(f"[QUIZ] Created session {session['id']}")
-
-    # Store questions
     quiz_questions = [
         {
             "question_id": q["id"],
@@ -117,9 +99,19 @@ def create_quiz_session(
         for idx, q in enumerate(questions)
     ]
 
-    repo.create_quiz_session_questions(session["id"], quiz_questions)
+    # Create the quiz session and store its questions in one round trip
+    session = repo.create_quiz_session_with_questions(
+        child_id=payload.child_id,
+        subject=payload.subject,
+        topic=payload.topic,
+        subtopic=payload.subtopic,
+        question_count=payload.question_count,
+        duration_sec=payload.duration_sec,
+        difficulty_mix=mix_dict,
+        questions=quiz_questions,
+    )
 
-    logger.info(f"[QUIZ] Stored {len(quiz_questions)} questions for session {session['id']}")
+    logger.info(f"[QUIZ] Created session {session['id']} with {len(quiz_questions)} questions")
 
     # Prepare response (hide correct answers)
     question_displays = [
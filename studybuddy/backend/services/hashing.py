@@ -3,9 +3,13 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any
 
 
-def hash_question(stem: str, options: list[str], answer: str) -> str:
+def question_digest(stem: str, options: list[str], answer: str) -> bytes:
+    """Return the raw SHA256 digest identifying a question."""
     payload = json.dumps({"stem": stem, "options": options, "answer": answer}, sort_keys=True)
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return hashlib.sha256(payload.encode("utf-8")).digest()
+
+
+def hash_question(stem: str, options: list[str], answer: str) -> str:
+    return question_digest(stem, options, answer).hex()
@@ -8,8 +8,13 @@ Key Principles:
 - Display: Format as Title Case for users
 - Content: Question stems, options, and answers preserve original case
 """
+from functools import lru_cache
 
 
+# Subjects, topics and subtopics come from a small vocabulary and are
+# normalized (and title-cased for display) on every request, so the results
+# are memoized.
+@lru_cache(maxsize=256)
 def normalize_subject(subject: str) -> str:
     """
     Normalize subject for storage and queries.
@@ -25,6 +30,7 @@ def normalize_subject(subject: str) -> str:
     return subject.lower().strip()
 
 
+@lru_cache(maxsize=256)
 def normalize_topic(topic: str) -> str:
     """
     Normalize topic for storage and queries.
@@ -40,6 +46,7 @@ def normalize_topic(topic: str) -> str:
     return topic.lower().strip()
 
 
+@lru_cache(maxsize=256)
 def normalize_subtopic(subtopic: str) -> str:
     """
     Normalize subtopic for storage and queries.
@@ -55,6 +62,7 @@ def normalize_subtopic(subtopic: str) -> str:
     return subtopic.lower().strip()
 
 
+@lru_cache(maxsize=256)
 def to_display_case(text: str) -> str:
     """
     Format text for display to users (Title Case).
@@ -0,0 +1,50 @@
+"""Tests for the in-process TTL cache."""
+from studybuddy.backend.services import cache
+from studybuddy.backend.services.cache import TTLCache
+
+
+class TestTTLCache:
+    """TTLCache expires entries and evicts the least recently used."""
+
+    def test_returns_default_on_miss(self):
+        entries = TTLCache(maxsize=2, ttl=60)
+
+        assert entries.get("missing") is None
+        assert entries.get("missing", "fallback") == "fallback"
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        entries = TTLCache(maxsize=2, ttl=60)
+        entries.set("token", {"id": "p1"})
+
+        now[0] += 59
+        assert entries.get("token") == {"id": "p1"}
+
+        now[0] += 1
+        assert entries.get("token") is None
+        assert len(entries) == 0
+
+    def test_evicts_least_recently_used(self):
+        entries = TTLCache(maxsize=2, ttl=60)
+        entries.set("a", 1)
+        entries.set("b", 2)
+        entries.get("a")
+
+        entries.set("c", 3)
+
+        assert entries.get("a") == 1
+        assert entries.get("b") is None
+        assert entries.get("c") == 3
+
+    def test_pop_and_clear(self):
+        entries = TTLCache(maxsize=4, ttl=60)
+        entries.set("a", 1)
+        entries.set("b", 2)
+
+        entries.pop("a")
+        entries.pop("missing")
+        assert entries.get("a") is None
+
+        entries.clear()
+        assert len(entries) == 0
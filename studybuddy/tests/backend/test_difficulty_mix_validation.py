@@ -0,0 +1,30 @@
+"""Tests for quiz difficulty mix validation."""
+import pytest
+from pydantic import ValidationError
+
+from studybuddy.backend.models import DifficultyMix
+
+
+class TestDifficultyMixValidation:
+    """Test DifficultyMix proportions validation."""
+
+    def test_defaults_are_valid(self):
+        """Test the default mix sums to 1.0."""
+        mix = DifficultyMix()
+        assert (mix.easy, mix.medium, mix.hard) == (0.3, 0.5, 0.2)
+
+    def test_floating_point_tolerance(self):
+        """Test that small floating point error is accepted."""
+        mix = DifficultyMix(easy=0.1, medium=0.7, hard=0.2)
+        assert mix.hard == 0.2
+
+    def test_sum_must_be_one(self):
+        """Test that proportions not summing to 1.0 are rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            DifficultyMix(easy=0.5, medium=0.5, hard=0.5)
+        assert "sum to 1.0" in str(exc_info.value)
+
+    def test_sum_checked_when_hard_omitted(self):
+        """Test that the default for hard is included in the check."""
+        with pytest.raises(ValidationError):
+            DifficultyMix(easy=0.9, medium=0.5)
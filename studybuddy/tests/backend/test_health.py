@@ -91,7 +91,7 @@ def test_signup_child_flow_and_progress_reporting():
     assert payload["attempted"] == 1
     assert payload["correct"] == 1
     assert payload["current_streak"] == 1
-    assert payload["accuracy"] == 1.0
+    assert payload["accuracy"] == 100
 
     children = client.get("/children", headers=headers)
     assert children.status_code == 200
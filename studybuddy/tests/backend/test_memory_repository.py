@@ -0,0 +1,200 @@
+"""Tests for the in-memory repository."""
+import pytest
+
+from studybuddy.backend.db import memory
+from studybuddy.backend.db.memory import MemoryRepository
+from studybuddy.backend.services.hashing import hash_question
+
+
+def _question(index: int, **overrides) -> dict:
+    payload = {
+        "id": f"q{index}",
+        "subject": "math",
+        "topic": "addition",
+        "difficulty": "easy",
+        "stem": f"What is {index} + {index}?",
+        "options": [str(index * 2), "a", "b", "c"],
+        "correct_answer": str(index * 2),
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.fixture(autouse=True)
+def _no_seed_data(monkeypatch, tmp_path):
+    monkeypatch.setattr(memory, "SEED_DIR", tmp_path)
+
+
+def _empty_repo() -> MemoryRepository:
+    return MemoryRepository()
+
+
+class TestListQuestionsOrdering:
+    """list_questions returns questions oldest first."""
+
+    def test_returns_questions_in_insertion_order(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(i) for i in range(5)])
+
+        ids = [q["id"] for q in repo.list_questions(subject="math")]
+
+        assert ids == ["q0", "q1", "q2", "q3", "q4"]
+
+    def test_upserted_question_moves_to_end(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(i) for i in range(3)])
+
+        repo.upsert_question({**_question(0), "stem": "Updated stem"})
+
+        ids = [q["id"] for q in repo.list_questions(subject="math")]
+        created = [repo.questions[q_id].created_at for q_id in ids]
+        assert ids == ["q1", "q2", "q0"]
+        assert created == sorted(created)
+
+    def test_limit_returns_oldest_matches(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(i, topic="subtraction" if i == 1 else "addition") for i in range(5)])
+
+        ids = [q["id"] for q in repo.list_questions(subject="math", topic="addition", limit=2)]
+
+        assert ids == ["q0", "q2"]
+        assert repo.list_questions(subject="math", limit=0) == []
+
+
+class TestQuestionHashes:
+    """Hashes are stored as digest bytes but exposed as hex strings."""
+
+    def test_hashes_round_trip_as_hex(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(1)])
+
+        record = repo.questions["q1"]
+        exposed = repo.list_questions(subject="math")[0]["hash"]
+
+        assert isinstance(record.hash, bytes)
+        assert exposed == hash_question(record.stem, record.options, record.correct_answer)
+
+    def test_exclude_hashes_accepts_hex_strings(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(1), _question(2)])
+        excluded = repo.list_questions(subject="math")[0]["hash"]
+
+        remaining = repo.list_questions(subject="math", exclude_hashes=[excluded])
+
+        assert [q["id"] for q in remaining] == ["q2"]
+
+    def test_non_hex_hashes_are_preserved(self):
+        repo = _empty_repo()
+
+        repo.upsert_question({**_question(1), "hash": "custom_hash"})
+
+        assert repo.list_questions(subject="math")[0]["hash"] == "custom_hash"
+
+
+class TestInsertQuestions:
+    """Bulk inserts skip questions whose hash is already stored."""
+
+    def test_skips_duplicates_within_and_across_batches(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(1), _question(1, id="dup"), _question(2)])
+
+        repo.insert_questions([_question(2, id="dup2"), _question(3)])
+
+        assert list(repo.questions) == ["q1", "q2", "q3"]
+
+    def test_replacing_an_id_releases_its_hash(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(1)])
+
+        repo.insert_questions([_question(2, id="q1")])
+        repo.insert_questions([_question(1, id="q9")])
+
+        assert list(repo.questions) == ["q1", "q9"]
+
+    def test_exclude_hashes_keeps_created_at_order(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(i) for i in range(6)])
+        hashes = {q["id"]: q["hash"] for q in repo.list_questions(subject="math")}
+
+        remaining = repo.list_questions(subject="math", exclude_hashes=[hashes["q1"], hashes["q4"]])
+
+        assert [q["id"] for q in remaining] == ["q0", "q2", "q3", "q5"]
+
+
+class TestFindStandards:
+    """Standards filter by case-insensitive subject and grade."""
+
+    def test_filters_by_subject_and_grade(self):
+        repo = _empty_repo()
+        repo.insert_standard("Math", 3, "OA", "A", "3.OA.1", "T", "D")
+        repo.insert_standard("math", 4, "NBT", "A", "4.NBT.1", "T", "D")
+        repo.insert_standard("reading", 3, "RL", "A", "RL.3.1", "T", "D")
+
+        def refs(standards):
+            return [standard["standard_ref"] for standard in standards]
+
+        assert refs(repo.find_standards(subject="MATH")) == ["3.OA.1", "4.NBT.1"]
+        assert refs(repo.find_standards(subject="math", grade=3)) == ["3.OA.1"]
+        assert refs(repo.find_standards(grade=3)) == ["3.OA.1", "RL.3.1"]
+        assert repo.find_standards(subject="math", grade=5) == []
+
+
+class TestGetChildForParent:
+    """Children are only returned to the parent that owns them."""
+
+    def test_returns_child_only_for_owner(self):
+        repo = _empty_repo()
+        child = repo.create_child("p1", {"name": "Kid", "grade": 3})
+
+        assert repo.get_child_for_parent(child["id"], "p1") == repo.get_child(child["id"])
+        assert repo.get_child_for_parent(child["id"], "p2") is None
+        assert repo.get_child_for_parent("missing", "p1") is None
+
+
+class TestChildProgress:
+    """Progress totals, streak and per-subject stats for one child."""
+
+    def test_streak_counts_attempts_since_last_miss(self):
+        repo = _empty_repo()
+        repo.insert_questions([_question(0), _question(1, subject="reading")])
+        for question_id, selected in [("q0", "0"), ("q1", "x"), ("q0", "0"), ("q1", "2")]:
+            repo.log_attempt(child_id="c1", question_id=question_id, selected=selected, time_spent_ms=1)
+        repo.log_attempt(child_id="c2", question_id="q0", selected="x", time_spent_ms=1)
+
+        progress = repo.child_progress("c1")
+
+        assert progress["attempted"] == 4
+        assert progress["correct"] == 3
+        assert progress["accuracy"] == 75
+        assert progress["current_streak"] == 2
+        assert progress["by_subject"] == {
+            "math": {"correct": 2, "total": 2, "accuracy": 100},
+            "reading": {"correct": 1, "total": 2, "accuracy": 50},
+        }
+        assert repo.child_progress("c3")["current_streak"] == 0
+
+
+class TestCreateQuizSessionWithQuestions:
+    """A quiz session is created together with its ordered questions."""
+
+    def test_links_questions_to_new_session(self):
+        repo = _empty_repo()
+        questions = [
+            {"question_id": f"q{i}", "index": i, "correct_choice": str(i * 2), "explanation": ""}
+            for i in range(5)
+        ]
+
+        session = repo.create_quiz_session_with_questions(
+            child_id="c1",
+            subject="math",
+            topic="addition",
+            subtopic=None,
+            question_count=5,
+            duration_sec=300,
+            difficulty_mix={"easy": 5},
+            questions=questions,
+        )
+
+        stored = [q for q in repo.quiz_session_questions if q.quiz_session_id == session["id"]]
+        assert repo.get_quiz_session(session["id"]) == session
+        assert [(q.question_id, q.index) for q in stored] == [(f"q{i}", i) for i in range(5)]
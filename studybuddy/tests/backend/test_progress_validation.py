@@ -1,8 +1,11 @@
 """Tests for progress response validation."""
+from datetime import datetime, timezone
+
 import pytest
 from pydantic import ValidationError
 
-from studybuddy.backend.models import ProgressResponse, SubjectBreakdown
+from studybuddy.backend.models import Parent, ProgressResponse, SubjectBreakdown
+from studybuddy.backend.routes.progress import get_progress
 
 
 class TestProgressResponseValidation:
@@ -200,3 +203,43 @@ class TestSubjectBreakdownValidation:
             )
             assert breakdown.accuracy == accuracy
             assert isinstance(breakdown.accuracy, int)
+
+
+_PARENT = Parent(id="p1", email="parent@example.com", created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+
+class _StubProgressRepository:
+    """Returns child_progress in the shape PostgresRepository produces."""
+
+    def child_belongs_to_parent(self, child_id, parent_id):
+        return True
+
+    def child_progress(self, child_id):
+        return {
+            "attempted": 4,
+            "correct": 3,
+            "accuracy": 75,
+            "current_streak": 2,
+            "by_subject": {
+                "Math": {"correct": 2, "total": 2, "accuracy": 100},
+                "Reading": {"correct": 1, "total": 2, "accuracy": 50},
+            },
+        }
+
+
+class TestProgressRoute:
+    """The progress route passes repository percentages through unchanged."""
+
+    def test_repository_percentages_are_not_rescaled(self):
+        progress = get_progress("c1", parent=_PARENT, repo=_StubProgressRepository())
+
+        assert progress.accuracy == 75
+        assert progress.by_subject["Math"].accuracy == 100
+        assert progress.by_subject["Reading"].accuracy == 50
+
+    def test_ratio_accuracy_is_rejected(self):
+        repo = _StubProgressRepository()
+        repo.child_progress = lambda child_id: {**_StubProgressRepository().child_progress(child_id), "accuracy": 0.75}
+
+        with pytest.raises(ValidationError):
+            get_progress("c1", parent=_PARENT, repo=repo)